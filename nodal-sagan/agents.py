@@ -1,51 +1,89 @@
-import re
+import os
 import asyncio
+import logging
 import random
-from typing import List, Dict, Optional, Tuple
+import time
+from dataclasses import asdict, replace
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from mock_github import MockFile, MockGitHub, MockPR
+from rules import Finding, scan_content, scan_path
+from diffscan import DEFAULT_CONTEXT, scan_changes
+from backends import ExecutionBackend
+from pacing import MissionClock, Pacing
+from scan_cache import ScanCache
+import metrics
+from fixes import FixResult, apply_edits, plan_fixes, resolve_rule_id
+from outbox import Outbox, OutboxFlushError
+
+logger = logging.getLogger(__name__)
+
+# Name given to the vulnerable file of a generated PR, per language
+VULN_FILENAMES = {
+    "python": "app.py",
+    "javascript": "app.js",
+    "abap": "z_vuln.abap",
+    "java": "App.java",
+    "go": "main.go",
+    "ruby": "app.rb",
+}
+
+# File extension -> language, derived from the names above
+EXTENSION_LANGUAGES = {os.path.splitext(name)[1]: language for language, name in VULN_FILENAMES.items()}
+
+def language_for_path(path: str) -> Optional[str]:
+    """Infers a file's language from its extension; None if it isn't one we scan."""
+    return EXTENSION_LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+# (name, code) snippets per language, plus (filename, code) safe files under "safe".
+# Read-only and shared by every VulnerabilityFactory.
+SNIPPETS: Mapping[str, Any] = MappingProxyType({
+    "python": (
+        ("Hardcoded Password", 'def connect():\n    password = "supersecret"\n    db.connect(password)'),
+        ("Remote Code Execution", 'def process_input(user_input):\n    result = eval(user_input)\n    return result'),
+        ("SQL Injection", 'def get_user(uid):\n    query = f"SELECT * FROM users WHERE id = {uid}"\n    cursor.execute(query)')
+    ),
+    "javascript": (
+        ("Cross-Site Scripting (XSS)", 'function showName(name) {\n    document.getElementById("output").innerHTML = name;\n}'),
+        ("Hardcoded Password", 'const dbConfig = {\n    password: "admin_password_123"\n};'),
+        ("Insecure Direct Object Reference", 'app.get("/files/:id", (req, res) => {\n    res.sendFile("/var/www/uploads/" + req.params.id);\n});')
+    ),
+    "abap": (
+        ("SQL Injection", 'REPORT z_report.\nEXEC SQL.\n  DELETE FROM usr02 WHERE bname = :user_input\nENDEXEC.'),
+        ("Missing Authority Check", 'REPORT z_auth_check.\nSELECT * FROM usr02 INTO TABLE lt_users.\n" Missing security check')
+    ),
+    "java": (
+        ("SQL Injection", 'public void getUser(String userId) {\n    String query = "SELECT * FROM users WHERE id = " + userId;\n    statement.executeQuery(query);\n}'),
+        ("Log Injection", 'public void logUser(String user) {\n    logger.info("User login: " + user);\n}')
+    ),
+    "go": (
+        ("SQL Injection", 'func GetUser(id string) {\n    query := fmt.Sprintf("SELECT * FROM users WHERE id = %s", id)\n    db.Query(query)\n}'),
+        ("Command Injection", 'func RunCmd(cmd string) {\n    exec.Command("sh", "-c", cmd).Run()\n}')
+    ),
+    "ruby": (
+        ("Command Injection", 'def run_command(cmd)\n  system("echo " + cmd)\nend'),
+        ("Hardcoded Secret", 'class Config\n  API_KEY = "12345-abcde"\nend')
+    ),
+    # Helper to generate safe code
+    "safe": MappingProxyType({
+        "python": (("utils.py", "def format_date(d):\n    return d.isoformat()"), ("config.py", "DEBUG = False\nMAX_RETRIES = 5")),
+        "javascript": (("utils.js", "export const formatDate = (d) => d.toISOString();"), ("constants.js", "export const MAX_ITEMS = 100;")),
+        "abap": (("z_utils.abap", "CLASS z_utils DEFINITION.\n  PUBLIC SECTION.\n  METHODS get_date RETURNING VALUE(r_date) TYPE d.\nENDCLASS."), ("z_const.abap", "CONSTANTS: gc_max_rows TYPE i VALUE 100.")),
+        "java": (("Utils.java", "public class Utils {\n    public static String format(Date d) { return d.toString(); }\n}"), ("Config.java", "public class Config {\n    public static final boolean DEBUG = false;\n}")),
+        "go": (("utils.go", "package main\n\nfunc Format(s string) string {\n    return strings.ToUpper(s)\n}"), ("config.go", "package main\n\nconst Timeout = 30")),
+        "ruby": (("utils.rb", "def format_string(s)\n  s.upcase\nend"), ("config.rb", "TIMEOUT = 30"))
+    }),
+})
 
 class VulnerabilityFactory:
     """
     Generates random vulnerable code snippets for various languages.
+    Pass a seed to get the same sequence of PRs on every run.
     """
-    def __init__(self):
-        self.snippets = {
-            "python": [
-                ("Hardcoded Password", 'def connect():\n    password = "supersecret"\n    db.connect(password)'),
-                ("Remote Code Execution", 'def process_input(user_input):\n    result = eval(user_input)\n    return result'),
-                ("SQL Injection", 'def get_user(uid):\n    query = f"SELECT * FROM users WHERE id = {uid}"\n    cursor.execute(query)')
-            ],
-            "javascript": [
-                ("Cross-Site Scripting (XSS)", 'function showName(name) {\n    document.getElementById("output").innerHTML = name;\n}'),
-                ("Hardcoded Password", 'const dbConfig = {\n    password: "admin_password_123"\n};'),
-                ("Insecure Direct Object Reference", 'app.get("/files/:id", (req, res) => {\n    res.sendFile("/var/www/uploads/" + req.params.id);\n});')
-            ],
-            "abap": [
-                ("SQL Injection", 'REPORT z_report.\nEXEC SQL.\n  DELETE FROM usr02 WHERE bname = :user_input\nENDEXEC.'),
-                ("Missing Authority Check", 'REPORT z_auth_check.\nSELECT * FROM usr02 INTO TABLE lt_users.\n" Missing security check')
-            ],
-            "java": [
-                ("SQL Injection", 'public void getUser(String userId) {\n    String query = "SELECT * FROM users WHERE id = " + userId;\n    statement.executeQuery(query);\n}'),
-                ("Log Injection", 'public void logUser(String user) {\n    logger.info("User login: " + user);\n}')
-            ],
-            "go": [
-                ("SQL Injection", 'func GetUser(id string) {\n    query := fmt.Sprintf("SELECT * FROM users WHERE id = %s", id)\n    db.Query(query)\n}'),
-                ("Command Injection", 'func RunCmd(cmd string) {\n    exec.Command("sh", "-c", cmd).Run()\n}')
-            ],
-            "ruby": [
-                ("Command Injection", 'def run_command(cmd)\n  system("echo " + cmd)\nend'),
-                ("Hardcoded Secret", 'class Config\n  API_KEY = "12345-abcde"\nend')
-            ],
-            # Helper to generate safe code
-            "safe": {
-                "python": [("utils.py", "def format_date(d):\n    return d.isoformat()"), ("config.py", "DEBUG = False\nMAX_RETRIES = 5")],
-                "javascript": [("utils.js", "export const formatDate = (d) => d.toISOString();"), ("constants.js", "export const MAX_ITEMS = 100;")],
-                "abap": [("z_utils.abap", "CLASS z_utils DEFINITION.\n  PUBLIC SECTION.\n  METHODS get_date RETURNING VALUE(r_date) TYPE d.\nENDCLASS."), ("z_const.abap", "CONSTANTS: gc_max_rows TYPE i VALUE 100.")],
-                "java": [("Utils.java", "public class Utils {\n    public static String format(Date d) { return d.toString(); }\n}"), ("Config.java", "public class Config {\n    public static final boolean DEBUG = false;\n}")],
-                "go": [("utils.go", "package main\n\nfunc Format(s string) string {\n    return strings.ToUpper(s)\n}"), ("config.go", "package main\n\nconst Timeout = 30")],
-                "ruby": [("utils.rb", "def format_string(s)\n  s.upcase\nend"), ("config.rb", "TIMEOUT = 30")]
-            }
-        }
+    snippets = SNIPPETS
+
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
 
     def generate_pr_files(self, language: str) -> List[Tuple[str, str]]:
         """Returns a list of (filename, content) tuples for a PR (mixed safe/vuln)."""
@@ -55,82 +93,97 @@ class VulnerabilityFactory:
         files = []
         
         # 1. Add a Random Vulnerable File
-        _, vuln_content = random.choice(self.snippets[language])
-        vuln_filename = "vulnerable_script.txt"
-        if language == "python": vuln_filename = "app.py"
-        elif language == "javascript": vuln_filename = "app.js"
-        elif language == "abap": vuln_filename = "z_vuln.abap"
-        elif language == "java": vuln_filename = "App.java"
-        elif language == "go": vuln_filename = "main.go"
-        elif language == "ruby": vuln_filename = "app.rb"
+        _, vuln_content = self.random.choice(self.snippets[language])
+        vuln_filename = VULN_FILENAMES.get(language, "vulnerable_script.txt")
         files.append((vuln_filename, vuln_content))
 
         # 2. Add 1-2 Safe Files
         if language in self.snippets["safe"]:
             safe_choices = self.snippets["safe"][language]
             # Pick 1 or 2 safe files
-            for safe_file in random.sample(safe_choices, k=random.randint(1, len(safe_choices))):
+            for safe_file in self.random.sample(safe_choices, k=self.random.randint(1, len(safe_choices))):
                 files.append(safe_file)
         
         return files
 
+    def generate_pr(self, language: str, n_files: int = 3, file_size: int = 0, density: float = 0.34,
+                    mix: Optional[Dict[str, float]] = None) -> List[Tuple[str, str]]:
+        """
+        Returns `n_files` (filename, content) tuples of at least `file_size`
+        characters, padded with the language's safe snippets. Each file is
+        vulnerable with probability `density`; `mix` weights which
+        vulnerability (by snippet name, e.g. {"SQL Injection": 3}) is planted.
+        """
+        if language not in self.snippets or language == "safe":
+            raise ValueError(f"Unknown language '{language}'")
+        vulns = self.snippets[language]
+        weights = None
+        if mix is not None:
+            unknown = set(mix) - {name for name, _ in vulns}
+            if unknown:
+                raise ValueError(f"No {language} snippet named {', '.join(sorted(unknown))}")
+            weights = [mix.get(name, 0.0) for name, _ in vulns]
+            if any(weight < 0 for weight in weights) or not sum(weights) > 0:
+                raise ValueError(f"Snippet weights must be non-negative with at least one positive, got {mix}")
+        safe = [content for _, content in self.snippets["safe"][language]]
+        per_file = max(1, -(-file_size // (sum(map(len, safe)) // len(safe) + 1)))  # ceil(size / avg snippet)
+        stem, ext = os.path.splitext(VULN_FILENAMES[language])
+
+        files = []
+        for i in range(n_files):
+            blocks = self.random.choices(safe, k=per_file)
+            size = sum(map(len, blocks)) + 2 * (len(blocks) - 1)
+            while size < file_size:
+                blocks.append(self.random.choice(safe))
+                size += len(blocks[-1]) + 2
+            if self.random.random() < density:
+                _, vuln_content = self.random.choices(vulns, weights=weights)[0]
+                blocks.insert(self.random.randint(0, len(blocks)), vuln_content)
+            files.append((f"{stem}_{i}{ext}", "\n\n".join(blocks)))
+        return files
+
+    def iter_prs(self, count: Optional[int] = None, languages: Optional[List[str]] = None,
+                 **options) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Lazily yields (language, files) for `count` PRs (endlessly if None),
+        cycling through `languages` (default: all). `options` go to generate_pr.
+        """
+        languages = languages or [language for language in self.snippets if language != "safe"]
+        produced = 0
+        while count is None or produced < count:
+            language = languages[produced % len(languages)]
+            yield language, self.generate_pr(language, **options)
+            produced += 1
+
 class HackerAgent:
     """
     Role: Hack the code by exploiting vulnerabilities.
     DoD: Hack the code.
     """
     def hack(self, file: MockFile) -> List[str]:
-        vulnerabilities = []
-        c = file.content
-        print(f"DEBUG: Hacking {file.language} file content: {c}") 
-        
-        # Python
-        if file.language == "python":
-            if re.search(r'password\s*=\s*"', c) and 'os.getenv' not in c:
-                 vulnerabilities.append("Exploit Successful: Extracted Admin Password")
-            if "eval(" in c and "ast.literal_eval" not in c:
-                 vulnerabilities.append("Exploit Successful: Remote Code Execution via eval()")
-            if "SELECT * FROM" in c and "f\"" in c and "?" not in c:
-                 vulnerabilities.append("Exploit Successful: SQL Injection via f-string")
-
-        # JavaScript
-        elif file.language == "javascript":
-             if "innerHTML =" in c:
-                 vulnerabilities.append("Exploit Successful: Stored XSS Payload in DOM")
-             if ("password:" in c) and 'process.env' not in c:
-                 vulnerabilities.append("Exploit Successful: Leaked DB Password")
-             if "res.sendFile" in c and "path.basename" not in c:
-                 vulnerabilities.append("Exploit Successful: Path Traversal /etc/passwd")
-
-        # ABAP
-        elif file.language == "abap":
-             if "EXEC SQL" in c:
-                 vulnerabilities.append("Exploit Successful: Dropped Table via Dynamic SQL")
-             if "SELECT * FROM" in c and "AUTHORITY-CHECK" not in c:
-                 vulnerabilities.append("Exploit Successful: Unauthorized Data Access")
-
-        # Java
-        elif file.language == "java":
-             if "SELECT * FROM" in c and "+" in c and "?" not in c:
-                 vulnerabilities.append("Exploit Successful: SQL Injection via String Concatenation")
-             if "logger.info" in c and "ESAPI" not in c:
-                 vulnerabilities.append("Exploit Successful: Forged Log Entries")
-
-        # Go
-        elif file.language == "go":
-             if "SELECT * FROM" in c and "fmt.Sprintf" in c:
-                 vulnerabilities.append("Exploit Successful: SQL Injection via Sprintf")
-             if "exec.Command" in c and "sh" in c and "isValid" not in c:
-                 vulnerabilities.append("Exploit Successful: Root Shell obtained")
-
-        # Ruby
-        elif file.language == "ruby":
-             if "system(" in c and "Safe arg" not in c:
-                 vulnerabilities.append("Exploit Successful: Server Hijacked via Command Injection")
-             if "API_KEY =" in c and "ENV[" not in c:
-                 vulnerabilities.append("Exploit Successful: Stolen API Key")
-        
-        return vulnerabilities
+        logger.debug("Hacking %s file %s (%d chars)", file.language, file.filename, len(file.content))
+        return _messages(self.scan(file))
+
+    def hack_changes(self, file: MockFile, context: int = DEFAULT_CONTEXT) -> List[str]:
+        """Like hack(), but only attacks the lines changed since the file's base revision."""
+        logger.debug("Hacking changed hunks of %s file %s", file.language, file.filename)
+        start = time.perf_counter()
+        findings = scan_changes(file, context, observe=metrics.observe_rule,
+                                on_scanned=lambda n: metrics.SCAN_BYTES.inc(n, language=file.language))
+        metrics.SCAN_SECONDS.observe(time.perf_counter() - start, language=file.language)
+        return _messages(findings)
+
+    def scan(self, file: MockFile) -> List[Finding]:
+        """Returns every rule hit in the file, with line/column offsets."""
+        start = time.perf_counter()
+        findings = scan_content(file.content, file.language, observe=metrics.observe_rule)
+        metrics.SCAN_SECONDS.observe(time.perf_counter() - start, language=file.language)
+        metrics.SCAN_BYTES.inc(len(file.content), language=file.language)
+        return findings
+
+    def scan_path(self, path: str, language: str) -> List[Finding]:
+        """Scans a file on disk in bounded-size chunks, for files too large to hold as a MockFile."""
+        return scan_path(path, language)
 
 class FixerAgent:
     """
@@ -138,61 +191,18 @@ class FixerAgent:
     DoD: Fix the code.
     """
     def fix(self, file: MockFile, vulnerability: str) -> str:
-        content = file.content
-        
-        # Python
-        if file.language == "python":
-            if "Password" in vulnerability:
-                content = re.sub(r'password\s*=\s*".*"', 'password = os.getenv("PASSWORD")', content) 
-                if "import os" not in content: content = "import os\n" + content
-            if "Remote Code Execution" in vulnerability:
-                 content = content.replace("eval(", "ast.literal_eval(")
-                 if "import ast" not in content: content = "import ast\n" + content
-            if "SQL Injection" in vulnerability:
-                 content = content.replace('f"SELECT * FROM users WHERE id = {uid}"', '"SELECT * FROM users WHERE id = ?", (uid,)')
-        
-        # JavaScript
-        elif file.language == "javascript":
-             if "XSS" in vulnerability:
-                 content = content.replace("innerHTML =", "textContent =")
-             if "Password" in vulnerability:
-                 content = re.sub(r'password:\s*".*"', 'password: process.env.DB_PASSWORD', content)
-             if "Path Traversal" in vulnerability:
-                 content = content.replace('req.params.id', 'path.basename(req.params.id)')
-
-        # ABAP
-        elif file.language == "abap":
-             if "SQL" in vulnerability:
-                 content = content.replace("EXEC SQL", "-- Secured with Open SQL")
-                 content += "\n* Fixed by Agent: Replaced Dynamic SQL with Open SQL"
-             if "Unauthorized" in vulnerability:
-                 content = 'AUTHORITY-CHECK OBJECT \'S_TCODE\' ID \'TCD\' FIELD \'Z_AUTH\'.\nIF sy-subrc = 0.\n  ' + content + '\nENDIF.'
-
-        # Java
-        elif file.language == "java":
-             if "SQL Injection" in vulnerability:
-                  content = content.replace('" + userId', '?"'); 
-                  content = content.replace("statement.executeQuery(query)", "statement.prepareStatement(query, userId).executeQuery()")
-             if "Log" in vulnerability:
-                  # Simple replace to ensure ESAPI is present for the scanner
-                  content = content.replace("logger.info", "logger.info(ESAPI.encoder().encodeForHTML")
-
-        # Go
-        elif file.language == "go":
-             if "SQL Injection" in vulnerability:
-                  content = content.replace('fmt.Sprintf("SELECT * FROM users WHERE id = %s", id)', '"SELECT * FROM users WHERE id = ?", id')
-             if "Root Shell" in vulnerability:
-                  content = content.replace('exec.Command("sh", "-c", cmd)', '// Validate input first\n    if isValid(cmd) { exec.Command(cmd) }')
-
-        # Ruby
-        elif file.language == "ruby":
-             if "Command Injection" in vulnerability:
-                  content = content.replace('system("echo " + cmd)', 'system("echo", cmd) # Safe arg passing')
-             if "API Key" in vulnerability:
-                  # Use simple replace for robustness
-                  content = content.replace('API_KEY = "12345-abcde"', 'API_KEY = ENV["API_KEY"]')
-
-        return content
+        """Remediates one finding, given as a rule id or as the message HackerAgent reported."""
+        return self.fix_findings(file, [vulnerability]).content
+
+    def fix_findings(self, file: MockFile, vulnerabilities: List[str]) -> FixResult:
+        """
+        Remediates every finding in one rewrite pass over the file. Returns the
+        new content and the edits made, as spans of the original content.
+        Findings without a known fix are ignored.
+        """
+        rule_ids = [resolve_rule_id(file.language, v) for v in vulnerabilities]
+        edits = plan_fixes(file.content, [r for r in rule_ids if r])
+        return FixResult(apply_edits(file.content, edits), edits)
 
     def generate_security_test(self, vulnerability: str, language: str) -> str:
         """
@@ -212,84 +222,264 @@ class FixerAgent:
         
         return test_template
 
+def _messages(findings: List[Finding]) -> List[str]:
+    """One vulnerability message per rule, in rule order."""
+    vulnerabilities = []
+    for finding in findings:
+        if finding.message not in vulnerabilities:
+            vulnerabilities.append(finding.message)
+    return vulnerabilities
+
+def hack_file(file: MockFile, diff_context: Optional[int] = None) -> List[str]:
+    """
+    Module-level entry point so hacking can be dispatched to worker processes.
+    With a diff_context, files that have a base revision are only hacked on
+    their changed hunks plus that many lines of context.
+    """
+    if diff_context is not None:
+        return HackerAgent().hack_changes(file, diff_context)
+    return HackerAgent().hack(file)
+
+def fix_file(file: MockFile, vulnerabilities: List[str]) -> FixResult:
+    """Applies every vulnerability fix to the file and returns the new content with its edits."""
+    return FixerAgent().fix_findings(file, vulnerabilities)
+
 class SupervisorAgent:
     """
     Role: Orchestrate interaction between Hacker and Fixer.
     DoD: Code should be vulnerability free, summarize breach and fix, provide fixed code and tests.
     """
-    def __init__(self, github: MockGitHub):
+    def __init__(self, github: MockGitHub, backend: Optional[ExecutionBackend] = None, pacing: Optional[Pacing] = None,
+                 scan_cache: Optional[ScanCache] = None, diff_context: Optional[int] = None, fail_fast: bool = False,
+                 max_rounds: int = 3, outbox: Optional[Outbox] = None):
         self.github = github
+        # When set, comments, checks and file updates are queued here and sent once the mission ends
+        self.outbox = outbox
+        self.host = outbox or github
         self.hacker = HackerAgent()
         self.fixer = FixerAgent()
+        # Per-file hack/fix work is dispatched here; inline keeps it on the event loop
+        self.backend = backend or ExecutionBackend()
+        self.pacing = pacing or Pacing("demo")
+        self.scan_cache = scan_cache
+        # When set, only changed hunks (plus this many context lines) are hacked
+        self.diff_context = diff_context
+        # When set, validation stops at the first exploit still present
+        self.fail_fast = fail_fast
+        # Upper bound on fix -> re-hack rounds per mission
+        self.max_rounds = max(1, max_rounds)
+
+    async def hack_files(self, files: List[MockFile]) -> List[List[str]]:
+        """Hacks every file, serving unchanged content from the scan cache when one is configured."""
+        if self.scan_cache is None:
+            return await self.backend.map(hack_file, [(file, self.diff_context) for file in files])
+
+        # Hashing a large PR takes a while; blake2b releases the GIL, so do it off the loop
+        keys = await asyncio.to_thread(self.scan_cache.keys, files, self.diff_context)
+        results = [self.scan_cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        scanned = await self.backend.map(hack_file, [(files[i], self.diff_context) for i in misses])
+        for i, exploits in zip(misses, scanned):
+            self.scan_cache.put(keys[i], exploits)
+            results[i] = exploits
+        return results
+
+    async def validate_files(self, files: List[MockFile], fail_fast: bool = False) -> Dict[str, List[str]]:
+        """
+        Re-hacks patched files and returns filename -> exploits for those still
+        exploitable. With fail_fast, returns as soon as any file still has
+        exploits and cancels the scans that have not started yet.
+        """
+        if not fail_fast:
+            return {file.filename: exploits for file, exploits in zip(files, await self.hack_files(files)) if exploits}
+
+        async def hack_one(file: MockFile):
+            [exploits] = await self.hack_files([file])
+            return file, exploits
+
+        pending = [asyncio.ensure_future(hack_one(file)) for file in files]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                file, exploits = await next_done
+                if exploits:
+                    return {file.filename: exploits}
+            return {}
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def flush_outbox(self, pr_id: int, log_callback):
+        """
+        Sends the mission's queued writes. Awaited before the mission returns
+        because the merge decision reads the check status back from the host.
+        If the host keeps failing this is logged and the writes stay queued
+        for Outbox.run to retry in the background.
+        """
+        if self.outbox is None:
+            return
+        try:
+            await self.outbox.flush(pr_id)
+        except OutboxFlushError as e:
+            await log_callback(f"Supervisor: Could not update the PR on the code host: {e}", agent="supervisor", phase="report")
 
-    async def run_mission(self, pr_id: int, log_callback):
+    async def run_mission(self, pr_id: int, log_callback, pacing: Optional[Pacing] = None,
+                          fail_fast: Optional[bool] = None):
+        """
+        log_callback is awaited as log_callback(message, agent=..., phase=...)
+        where phase is one of logstore.PHASE_STEPS. With fail_fast (default:
+        the supervisor's setting), validation stops at the first remaining
+        exploit, which is all a pass/fail merge gate needs.
+        """
+        fail_fast = self.fail_fast if fail_fast is None else fail_fast
         pr = self.github.get_pr(pr_id)
         if not pr:
             return
 
+        clock = MissionClock(pacing or self.pacing)
         simulation_result = {
             "vulnerabilities": [],
+            "findings": {}, # filename -> vulnerabilities found in that file
             "fixes": [],
-            "tests": []
+            "tests": [],
+            "timings": {}
         }
 
         # 1. Verification Phase (Hacker Agent)
-        await log_callback("Supervisor: Dispatching Hacker Agent to attempt exploits...")
-        await asyncio.sleep(1)
-        
-        for file in pr.files:
-            exploits = self.hacker.hack(file)
-            if exploits:
-                simulation_result["vulnerabilities"].extend(exploits)
-                await log_callback(f"Hacker Agent: {', '.join(exploits)}")
-                self.github.add_comment(pr.id, f"Security Breach: {', '.join(exploits)}")
-                self.github.update_check_status(pr.id, "Security Check", "FAIL")
-            else:
-                 await log_callback("Hacker Agent: No exploits found.")
+        with clock.phase("hack"):
+            await log_callback("Supervisor: Dispatching Hacker Agent to attempt exploits...", agent="supervisor", phase="hack")
+            await clock.pause()
+            
+            scan_results = await self.hack_files(pr.files)
+            breach_comments = []
+            for file, exploits in zip(pr.files, scan_results):
+                if exploits:
+                    simulation_result["vulnerabilities"].extend(exploits)
+                    simulation_result["findings"][file.filename] = exploits
+                    await log_callback(f"Hacker Agent: {', '.join(exploits)}", agent="hacker", phase="hack")
+                    breach_comments.append(f"Security Breach: {', '.join(exploits)}")
+                else:
+                     await log_callback("Hacker Agent: No exploits found.", agent="hacker", phase="hack")
+            if breach_comments:
+                self.host.add_comments(pr.id, breach_comments)
+                self.host.set_checks(pr.id, {"Security Check": "FAIL"})
 
         if not simulation_result["vulnerabilities"]:
-             self.github.update_check_status(pr.id, "Security Check", "PASS")
-             await log_callback("Supervisor: System is secure. No action needed.")
+             self.host.update_check_status(pr.id, "Security Check", "PASS")
+             await log_callback("Supervisor: System is secure. No action needed.", agent="supervisor", phase="report")
+             await self.flush_outbox(pr.id, log_callback)
+             simulation_result["timings"] = clock.report()
+             metrics.observe_phases(simulation_result["timings"])
              return simulation_result
 
-        # 2. Remediation Phase (Fixer Agent)
-        await log_callback("Supervisor: Dispatching Fixer Agent for remediation...")
-        await asyncio.sleep(1)
-
-        for file in pr.files:
-            current_content = file.content
-            # Fix exploits one by one
-            for bug in simulation_result["vulnerabilities"]:
-                await log_callback(f"Fixer Agent: Patching {bug}...")
-                current_content = self.fixer.fix(
-                    MockFile(filename=file.filename, content=current_content, language=file.language), 
-                    bug
+        # 2./3. Remediation and validation, repeated on the files that are still exploitable.
+        # Each round fixes and re-hacks only the files whose content changed in the round
+        # before; a file whose fix yields no new content (or one seen before) is given up on.
+        findings = simulation_result["findings"]
+        to_fix = dict(findings) # filename -> exploits to patch this round
+        # The mission's own view of the files, so re-hacking never waits on writes to the host
+        working = {name: pr.get_file(name) for name in to_fix}
+        # Python's str hash is computed at C speed and cached on the string, which is all a
+        # per-mission cycle check needs (a collision would only end the loop early)
+        seen_hashes = {name: {hash(working[name].content)} for name in to_fix}
+        stuck: Dict[str, List[str]] = {} # filename -> exploits the fixer made no progress on
+        fix_entries: Dict[str, dict] = {}
+        tested = {name: set() for name in to_fix}
+        rescanned_files, rescanned_bytes, rounds, stopped_early = set(), 0, [], False
+        for round_no in range(1, self.max_rounds + 1):
+            with clock.phase("fix"):
+                started = time.perf_counter()
+                if round_no == 1:
+                    await log_callback("Supervisor: Dispatching Fixer Agent for remediation...", agent="supervisor", phase="fix")
+                else:
+                    await log_callback(f"Supervisor: Round {round_no}: {len(to_fix)} file(s) still exploitable, fixing again...", agent="supervisor", phase="fix")
+                await clock.pause()
+
+                # Only files with findings are patched, and only for their own findings
+                vulnerable_files = [working[name] for name in to_fix]
+                fix_results = await self.backend.map(
+                    fix_file, [(file, to_fix[file.filename]) for file in vulnerable_files]
                 )
-                await asyncio.sleep(1)
-                
-                # Generate Test
-                test_code = self.fixer.generate_security_test(bug, file.language)
-                simulation_result["tests"].append(test_code)
-                await log_callback(f"Fixer Agent: Generated Security Unit Test for {bug}")
-
-            # Update file
-            self.github.update_file_content(pr.id, file.filename, current_content)
-            simulation_result["fixes"].append({"filename": file.filename, "content": current_content})
-            self.github.add_comment(pr.id, "Supervisor: Vulnerabilities fixed and tests added.")
-
-        # 3. Validation Phase (Hacker Agent Retry)
-        await log_callback("Supervisor: Dispatching Hacker Agent for re-verification...")
-        await asyncio.sleep(1)
-        
-        remaining_exploits = []
-        for file in self.github.get_pr(pr.id).files:
-             remaining_exploits.extend(self.hacker.hack(file))
-        
+                updated_files, fix_comments, changed = {}, [], []
+                for file, fix_result in zip(vulnerable_files, fix_results):
+                    # Report each finding the fix covered and generate its test
+                    for bug in to_fix[file.filename]:
+                        await log_callback(f"Fixer Agent: Patching {bug} in {file.filename}...", agent="fixer", phase="fix")
+                        await clock.pause()
+
+                        # Generate Test
+                        if bug not in tested[file.filename]:
+                            tested[file.filename].add(bug)
+                            test_code = self.fixer.generate_security_test(bug, file.language)
+                            simulation_result["tests"].append(test_code)
+                            await log_callback(f"Fixer Agent: Generated Security Unit Test for {bug}", agent="fixer", phase="fix")
+
+                    new_hash = hash(fix_result.content)
+                    if new_hash in seen_hashes[file.filename]:
+                        stuck[file.filename] = to_fix[file.filename]
+                        continue
+                    seen_hashes[file.filename].add(new_hash)
+                    file = working[file.filename] = replace(file, content=fix_result.content, diff=None)
+                    changed.append(file)
+                    updated_files[file.filename] = fix_result.content
+                    entry = fix_entries.setdefault(file.filename, {"filename": file.filename, "edits": []})
+                    entry["content"] = fix_result.content
+                    # Edit spans refer to the file as it was at the start of their round
+                    entry["edits"].extend({**asdict(edit), "round": round_no} for edit in fix_result.edits)
+                    fix_comments.append(f"Supervisor: Vulnerabilities in {file.filename} fixed and tests added.")
+
+                # Commit every patched file and its comment in one call each
+                self.host.update_files(pr.id, updated_files)
+                self.host.add_comments(pr.id, fix_comments)
+                fix_seconds = time.perf_counter() - started
+
+            with clock.phase("validate"):
+                started = time.perf_counter()
+                await log_callback("Supervisor: Dispatching Hacker Agent for re-verification...", agent="supervisor", phase="validate")
+                await clock.pause()
+
+                # Files the fixer left untouched keep their earlier results; only changed files are re-scanned
+                if fail_fast and stuck:
+                    validated, to_fix, stopped_early = [], {}, True
+                else:
+                    validated = changed
+                    to_fix = await self.validate_files(validated, fail_fast)
+                    stopped_early = fail_fast and bool(to_fix)
+                rescanned_files.update(file.filename for file in validated)
+                rescanned_bytes += sum(len(file.content) for file in validated)
+                rounds.append({
+                    "round": round_no,
+                    "fixed": len(vulnerable_files),
+                    "changed": len(changed),
+                    "rescanned": len(validated),
+                    "remaining": len(to_fix) + len(stuck),
+                    "fix_seconds": round(fix_seconds, 6),
+                    "validate_seconds": round(time.perf_counter() - started, 6),
+                })
+            if not to_fix or stopped_early:
+                break
+
+        remaining = {**stuck, **to_fix}
+        remaining_exploits = [bug for file in pr.files for bug in remaining.get(file.filename, [])]
+        simulation_result["fixes"] = [fix_entries[file.filename] for file in pr.files if file.filename in fix_entries]
+        simulation_result["iterations"] = len(rounds)
+        simulation_result["rounds"] = rounds
+        simulation_result["converged"] = not remaining_exploits
+        simulation_result["no_progress"] = sorted(stuck)
+        simulation_result["validation"] = {
+            "rescanned": sum(r["rescanned"] for r in rounds),
+            "rescanned_bytes": rescanned_bytes,
+            "reused": len(pr.files) - len(rescanned_files),
+            "fail_fast": fail_fast,
+            "stopped_early": stopped_early,
+        }
         if not remaining_exploits:
-            await log_callback("Supervisor: All vulnerabilities eliminated.")
-            self.github.update_check_status(pr.id, "Security Check", "PASS")
+            await log_callback("Supervisor: All vulnerabilities eliminated.", agent="supervisor", phase="report")
+            self.host.update_check_status(pr.id, "Security Check", "PASS")
         else:
-            await log_callback(f"Supervisor: Critical Warning - Exploits still active: {remaining_exploits}")
-            self.github.update_check_status(pr.id, "Security Check", "FAIL")
+            await log_callback(f"Supervisor: Critical Warning - Exploits still active: {remaining_exploits}", agent="supervisor", phase="report")
+            self.host.update_check_status(pr.id, "Security Check", "FAIL")
+        await self.flush_outbox(pr.id, log_callback)
 
+        simulation_result["timings"] = clock.report()
+        metrics.observe_phases(simulation_result["timings"])
         return simulation_result
@@ -1,119 +1,417 @@
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from contextlib import asynccontextmanager
+from typing import Dict, Literal, Optional
 import asyncio
+import json
+import os
 import time
-import random
 
 from mock_github import MockGitHub, MockPR, MockFile
 from agents import SupervisorAgent, VulnerabilityFactory
+from scheduler import MissionScheduler, QueueFullError
+from backends import make_backend
+from pacing import Pacing
+from scan_cache import ScanCache
+from events import ChangeFeed, event_stream
+from logstore import PHASE_STEPS, LogSpill, MissionLog
+import metrics
+from store import MissionRecord, MissionStore
+from outbox import Outbox
+from payloads import content_hash, describe_files, describe_tests, empty_digests, etag_response, summarize_state
 
-app = FastAPI()
+# Log records kept in memory per mission; MISSION_LOG_FILE also appends every record to disk
+log_capacity = int(os.environ.get("MISSION_LOG_CAPACITY", "1000"))
+log_spill: Optional[LogSpill] = None # Opened by start_components()
 
-# Serve static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+def new_simulation_state() -> dict:
+    return {
+        "status": "IDLE", # IDLE, QUEUED, RUNNING, COMPLETED, ERROR
+        "logs": MissionLog(capacity=log_capacity, spill=log_spill),
+        "current_step": "",
+        "pr_details": {},
+        "vulnerabilities": [],
+        "fixed_code": {},
+        "generated_tests": [],
+        "digests": empty_digests(), # Hashes and sizes of the bodies above
+        "timings": {}
+    }
 
-# In-memory storage for simulation state
-simulation_state = {
-    "status": "IDLE", # IDLE, RUNNING, COMPLETED
-    "logs": [],
-    "current_step": "",
-    "pr_details": {},
-    "vulnerabilities": [],
-    "fixed_code": {},
-    "generated_tests": []
-}
+# State of the most recently started simulation (what the dashboard shows)
+simulation_state = new_simulation_state()
 
-github = MockGitHub()
-supervisor = SupervisorAgent(github)
-vuln_factory = VulnerabilityFactory()
+# Shared components, built from the environment when the app starts (see lifespan)
+# rather than on import, and torn down again when it stops.
+github: Optional[MockGitHub] = None
+mission_store: Optional[MissionStore] = None
+outbox: Optional[Outbox] = None
+supervisor: Optional[SupervisorAgent] = None
+vuln_factory: Optional[VulnerabilityFactory] = None
+scheduler: Optional[MissionScheduler] = None
+
+def start_components():
+    """Builds the shared components; does nothing if they already exist."""
+    global log_spill, github, mission_store, outbox, supervisor, vuln_factory, scheduler
+    if supervisor is not None:
+        return
+    log_spill = LogSpill(os.environ["MISSION_LOG_FILE"]) if "MISSION_LOG_FILE" in os.environ else None
+    github = MockGitHub()
+    # Finished missions are appended to this SQLite file when MISSION_STORE is set
+    mission_store = MissionStore(os.environ["MISSION_STORE"]) if "MISSION_STORE" in os.environ else None
+    if mission_store is not None:
+        # Keep PR numbers unique across restarts
+        github.next_pr_id = mission_store.last_mission_id() + 1
+    # Missions queue their comments, checks and file updates and send them in one batch at the end
+    outbox = Outbox(github, max_retries=int(os.environ.get("OUTBOX_RETRIES", "3"))) if os.environ.get("CODE_HOST_OUTBOX", "1") == "1" else None
+    supervisor = SupervisorAgent(
+        github,
+        backend=make_backend(
+            os.environ.get("EXECUTION_BACKEND", "thread"),
+            max_workers=int(os.environ["EXECUTION_WORKERS"]) if "EXECUTION_WORKERS" in os.environ else None,
+        ),
+        pacing=Pacing(os.environ.get("PACING", "demo")),
+        scan_cache=ScanCache(max_entries=int(os.environ.get("SCAN_CACHE_SIZE", "10000"))),
+        diff_context=int(os.environ["DIFF_CONTEXT"]) if "DIFF_CONTEXT" in os.environ else None,
+        fail_fast=os.environ.get("VALIDATION_FAIL_FAST", "0") == "1",
+        max_rounds=int(os.environ.get("FIX_MAX_ROUNDS", "3")),
+        outbox=outbox,
+    )
+    vuln_factory = VulnerabilityFactory()
+    scheduler = MissionScheduler(
+        max_workers=int(os.environ.get("MISSION_WORKERS", "4")),
+        max_queue=int(os.environ.get("MISSION_QUEUE_SIZE", "100")),
+        # Older finished missions are only available from the history store
+        max_finished=int(os.environ.get("MISSION_RETAIN", "1000")),
+    )
+
+async def stop_components():
+    """Stops the mission workers and releases the backend, store and log file."""
+    global log_spill, github, mission_store, outbox, supervisor, vuln_factory, scheduler
+    if supervisor is None:
+        return
+    await scheduler.shutdown()
+    supervisor.backend.shutdown()
+    if mission_store is not None:
+        mission_store.close()
+    if log_spill is not None:
+        await asyncio.to_thread(log_spill.close)
+    log_spill = github = mission_store = outbox = supervisor = vuln_factory = scheduler = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_components()
+    # Redelivers writes the outbox could not send when their mission ended
+    retry = asyncio.create_task(outbox.run(float(os.environ.get("OUTBOX_RETRY_INTERVAL", "5")))) if outbox is not None else None
+    try:
+        yield
+    finally:
+        if retry is not None:
+            retry.cancel()
+        await stop_components()
+
+router = APIRouter()
+
+# Upper bound on files * file_size for one synthetic PR, so a single request cannot exhaust memory
+MAX_SYNTHETIC_PR_BYTES = int(os.environ.get("MAX_SYNTHETIC_PR_BYTES", str(64 * 1024 * 1024)))
 
 class SimulationRequest(BaseModel):
     language: str # python, javascript, abap, java, go, ruby
+    pacing: Optional[Literal["demo", "throughput"]] = None # Defaults to the PACING setting
+    # Synthetic PR shape for load testing; without `files` the classic 2-3 file PR is generated
+    files: Optional[int] = Field(None, ge=1, le=10000)
+    file_size: int = Field(0, ge=0, le=10 * 1024 * 1024)
+    density: float = Field(0.34, ge=0.0, le=1.0)
+    seed: Optional[int] = None
+    profile: bool = False # Run the mission under cProfile and keep its top hotspots in the state
+
+    @model_validator(mode="after")
+    def check_total_size(self):
+        if self.files is not None and self.files * self.file_size > MAX_SYNTHETIC_PR_BYTES:
+            raise ValueError(f"files * file_size must not exceed {MAX_SYNTHETIC_PR_BYTES} bytes")
+        return self
+
+# Mission id -> feed that wakes up its event streams, while the mission is unfinished
+mission_feeds: Dict[int, ChangeFeed] = {}
+
+def make_log_callback(state: dict, feed: ChangeFeed):
+    async def log_callback(message: str, agent: str = "system", phase: str = ""):
+        state["logs"].append(message, agent=agent, phase=phase)
+        if phase in PHASE_STEPS:
+            state["current_step"] = PHASE_STEPS[phase]
+        feed.notify()
+    return log_callback
+
+def render_state(state: dict, since: Optional[int] = None) -> dict:
+    """JSON view of a mission state: log lines as formatted strings, optionally only those from `since` on."""
+    logs: MissionLog = state["logs"]
+    view = {**{key: value for key, value in state.items() if key != "digests"}, "logs": logs.lines(since or 0)}
+    if since is not None:
+        view["log_offset"] = max(since, logs.first_seq)
+        view["log_total"] = logs.total
+    return view
+
+async def create_simulation_pr(request: SimulationRequest, state: dict, feed: ChangeFeed) -> MockPR:
+    """Step 1: Create PR with Random Files (Mixed Vulnerability)"""
+    language = request.language
+    log_callback = make_log_callback(state, feed)
+    await log_callback(f"Step 1: Creating a simulated Pull Request for {language}...", phase="create")
 
-async def log_callback(message: str):
-    print(message)
-    simulation_state["logs"].append(f"[{time.strftime('%H:%M:%S')}] {message}")
-    if "Hacker" in message:
-        simulation_state["current_step"] = "Hacking..."
-    elif "Fixer" in message:
-        simulation_state["current_step"] = "Fixing..."
-    elif "Supervisor" in message:
-         simulation_state["current_step"] = "Orchestrating..."
-
-async def run_simulation_task(language: str):
-    simulation_state["status"] = "RUNNING"
-    simulation_state["logs"] = []
-    simulation_state["vulnerabilities"] = []
-    simulation_state["fixed_code"] = {}
-    simulation_state["generated_tests"] = []
+    factory = VulnerabilityFactory(request.seed) if request.seed is not None else vuln_factory
+    if request.files is None:
+        file_data_list = factory.generate_pr_files(language)
+    else:
+        try:
+            # Large synthetic PRs take a while to build; keep the event loop serving meanwhile
+            file_data_list = await asyncio.to_thread(
+                factory.generate_pr, language, request.files, request.file_size, request.density,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    pr_files = []
+    original_contents = {}
+
+    for fname, fcontent in file_data_list:
+        pr_files.append(MockFile(filename=fname, content=fcontent, language=language))
+        original_contents[fname] = fcontent
+        
+    pr = github.create_pr(title=f"Feature: Update {language} service", files=pr_files)
+    
+    state["pr_details"] = {
+        "id": pr.id,
+        "title": pr.title,
+        "status": pr.status,
+        "language": language,
+        "created_at": time.time(),
+        "files": original_contents # Dict of filename -> content
+    }
+    state["digests"]["files"] = await asyncio.to_thread(describe_files, original_contents)
+    state["logs"].mission_id = pr.id
+    await log_callback(f"PR #{pr.id} created: {pr.title} ({len(pr_files)} files)", agent="github", phase="create")
+    return pr
+
+async def run_simulation_task(pr_id: int, state: dict, feed: ChangeFeed, pacing: Optional[Pacing] = None,
+                              profile: bool = False):
+    state["status"] = "RUNNING"
+    feed.notify()
+    log_callback = make_log_callback(state, feed)
+    pacing = pacing or supervisor.pacing
+    result = None
     
     try:
-        # Step 1: Create PR with Random Files (Mixed Vulnerability)
-        await log_callback(f"Step 1: Creating a simulated Pull Request for {language}...")
-        simulation_state["current_step"] = "Creating PR"
-        await asyncio.sleep(1)
-
-        file_data_list = vuln_factory.generate_pr_files(language)
-        pr_files = []
-        original_contents = {}
-
-        for fname, fcontent in file_data_list:
-            pr_files.append(MockFile(filename=fname, content=fcontent, language=language))
-            original_contents[fname] = fcontent
-            
-        pr = github.create_pr(title=f"Feature: Update {language} service", files=pr_files)
-        
-        simulation_state["pr_details"] = {
-            "id": pr.id,
-            "title": pr.title,
-            "status": pr.status,
-            "files": original_contents # Dict of filename -> content
-        }
-        await log_callback(f"PR #{pr.id} created: {pr.title} ({len(pr_files)} files)")
-        
+        await pacing.pause()
+
         # Step 2: Delegate to Supervisor
-        result = await supervisor.run_mission(pr.id, log_callback)
+        if profile:
+            with metrics.profiled() as hotspots:
+                result = await supervisor.run_mission(pr_id, log_callback, pacing=pacing)
+            state["profile"] = hotspots
+        else:
+            result = await supervisor.run_mission(pr_id, log_callback, pacing=pacing)
         
         if result:
-            simulation_state["vulnerabilities"] = result["vulnerabilities"]
-            simulation_state["generated_tests"] = result["tests"]
+            state["vulnerabilities"] = result["vulnerabilities"]
+            state["generated_tests"] = result["tests"]
+            state["digests"]["generated_tests"] = describe_tests(result["tests"])
+            state["timings"] = result["timings"]
+            state["iterations"] = result.get("iterations", 0)
+            state["rounds"] = result.get("rounds", [])
             
-            # Store fixes as dict: filename -> content
-            simulation_state["fixed_code"] = {}
-            for fix in result["fixes"]:
-                simulation_state["fixed_code"][fix["filename"]] = fix["content"]
+            # Store fixes as dict: filename -> content, together with their digests
+            fixed_code = {fix["filename"]: fix["content"] for fix in result["fixes"]}
+            state["digests"]["fixed_code"] = await asyncio.to_thread(describe_files, fixed_code)
+            state["fixed_code"] = fixed_code
 
         # Step 3: Merge if secure
-        if github.get_pr(pr.id).checks.get("Security Check") == "PASS":
-            await log_callback("Supervisor: Validated. Merging Pull Request...")
-            simulation_state["current_step"] = "Merging"
-            github.merge_pr(pr.id)
-            await log_callback(f"PR #{pr.id} merged successfully.")
+        if github.get_pr(pr_id).checks.get("Security Check") == "PASS":
+            await log_callback("Supervisor: Validated. Merging Pull Request...", agent="supervisor", phase="merge")
+            github.merge_pr(pr_id)
+            await log_callback(f"PR #{pr_id} merged successfully.", agent="github", phase="merge")
         else:
-             await log_callback("Supervisor: PR rejected due to security risks.")
+             await log_callback("Supervisor: PR rejected due to security risks.", agent="supervisor", phase="report")
 
-        simulation_state["status"] = "COMPLETED"
-        simulation_state["current_step"] = "Done"
+        state["status"] = "COMPLETED"
+        state["current_step"] = "Done"
 
     except Exception as e:
         await log_callback(f"Error during simulation: {str(e)}")
-        simulation_state["status"] = "ERROR"
+        state["status"] = "ERROR"
+
+    if mission_store is not None:
+        try:
+            await asyncio.to_thread(mission_store.record_mission, mission_record(pr_id, state, result))
+        except Exception as e:
+            await log_callback(f"Could not persist mission: {str(e)}")
+    if outbox is not None:
+        outbox.finish(pr_id)
+    # Open streams keep their own reference and end on this last notification
+    feed.notify()
+    mission_feeds.pop(pr_id, None)
 
-@app.get("/")
+def mission_record(pr_id: int, state: dict, result: Optional[dict]) -> MissionRecord:
+    details = state["pr_details"]
+    return MissionRecord.from_mission(
+        github.get_pr(pr_id), details["language"], state["status"], details["files"], result, details["created_at"],
+    )
+
+async def submit_mission(request: SimulationRequest) -> dict:
+    """Creates a PR and queues its mission. Raises HTTP 429 when the queue is full."""
+    pacing = Pacing(request.pacing) if request.pacing else supervisor.pacing
+    state = new_simulation_state()
+    feed = ChangeFeed()
+    try:
+        # Reserve the slot before creating the PR: creation awaits, and a
+        # submission rejected after it would leave an orphan PR behind
+        scheduler.reserve()
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    try:
+        pr = await create_simulation_pr(request, state, feed)
+    except BaseException:
+        scheduler.release()
+        raise
+    state["status"] = "QUEUED"
+    state["pacing"] = pacing.mode
+    scheduler.submit(pr.id, state, lambda: run_simulation_task(pr.id, state, feed, pacing, request.profile),
+                     reserved=True)
+    mission_feeds[pr.id] = feed
+    return state
+
+@router.get("/")
 async def read_index():
     return FileResponse('static/index.html')
 
-@app.post("/api/start-simulation")
-async def start_simulation(request: SimulationRequest, background_tasks: BackgroundTasks):
-    if simulation_state["status"] == "RUNNING":
-         return {"message": "Simulation already running"}
-    
-    background_tasks.add_task(run_simulation_task, request.language)
-    return {"message": "Simulation started"}
+@router.post("/api/start-simulation")
+async def start_simulation(request: SimulationRequest):
+    global simulation_state
+    simulation_state = await submit_mission(request)
+    return {"message": "Simulation started", "mission_id": simulation_state["pr_details"]["id"]}
+
+@router.get("/api/status")
+async def get_status(since: Optional[int] = None, full: bool = False):
+    """
+    Summary of the current simulation, with file bodies and tests replaced by
+    content hashes (?full=1 inlines them). With ?since=N only the log lines
+    from offset N onwards are included.
+    """
+    if full:
+        return render_state(simulation_state, since)
+    return summarize_state(simulation_state, since)
+
+@router.post("/api/missions")
+async def create_mission(request: SimulationRequest):
+    state = await submit_mission(request)
+    return {"mission_id": state["pr_details"]["id"], "status": state["status"]}
+
+def get_mission_or_404(mission_id: int):
+    mission = scheduler.get(mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    return mission
+
+@router.get("/api/missions/{mission_id}")
+async def get_mission(mission_id: int, since: Optional[int] = None, full: bool = False):
+    """Same view as /api/status, for one mission; the dashboard polls this for the mission it streams."""
+    mission = get_mission_or_404(mission_id)
+    view = render_state(mission.state, since) if full else summarize_state(mission.state, since)
+    return {"id": mission.id, "timing": mission.timing(), **view}
+
+@router.get("/api/missions/{mission_id}/files/{filename:path}")
+async def get_mission_file(mission_id: int, filename: str, version: Literal["original", "fixed"] = "original",
+                           if_none_match: Optional[str] = Header(None)):
+    """One file body as submitted or as fixed; the ETag is the hash listed in the status summary."""
+    state = get_mission_or_404(mission_id).state
+    key = "files" if version == "original" else "fixed_code"
+    files = state["pr_details"].get("files", {}) if version == "original" else state["fixed_code"]
+    if filename not in files:
+        raise HTTPException(status_code=404, detail="File not found")
+    etag = state["digests"][key][filename]["hash"]
+    return etag_response(files[filename], etag, if_none_match, "text/plain; charset=utf-8")
+
+@router.get("/api/missions/{mission_id}/tests")
+async def get_mission_tests(mission_id: int, if_none_match: Optional[str] = Header(None)):
+    state = get_mission_or_404(mission_id).state
+    etag = state["digests"]["generated_tests"]["hash"]
+    return etag_response(json.dumps(state["generated_tests"]), etag, if_none_match, "application/json")
+
+@router.get("/api/missions/{mission_id}/logs")
+async def get_mission_logs(mission_id: int, since: int = 0):
+    """Structured log records (seq, ts, agent, phase, message) still held for the mission."""
+    mission = get_mission_or_404(mission_id)
+    logs: MissionLog = mission.state["logs"]
+    return {"first_seq": logs.first_seq, "total": logs.total, "records": logs.to_dicts(since)}
+
+@router.get("/api/missions/{mission_id}/events")
+async def stream_mission_events(mission_id: int, offset: int = 0, last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events stream of log lines and state transitions; resumes from Last-Event-ID or ?offset=N."""
+    mission = get_mission_or_404(mission_id)
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+    return StreamingResponse(
+        # A finished mission has no feed; its stream replays the logs and ends without waiting
+        event_stream(mission.state, mission_feeds.get(mission_id) or ChangeFeed(), offset=offset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@router.get("/api/scheduler")
+async def get_scheduler_metrics():
+    return scheduler.metrics()
+
+@router.get("/api/scan-cache")
+async def get_scan_cache_stats():
+    return supervisor.scan_cache.stats()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of phase, scan, rule and queue metrics."""
+    queue = scheduler.metrics()
+    cache = supervisor.scan_cache.stats()
+    return PlainTextResponse(metrics.render({
+        "mission_queue_depth": queue["queue_depth"],
+        "missions_running": queue["running"],
+        "scan_cache_entries": cache["entries"],
+        "scan_cache_hit_ratio": cache["hit_ratio"],
+    }), media_type="text/plain; version=0.0.4")
+
+def get_store_or_404() -> MissionStore:
+    if mission_store is None:
+        raise HTTPException(status_code=404, detail="Mission history is disabled (set MISSION_STORE)")
+    return mission_store
+
+@router.get("/api/history/missions")
+async def list_history(language: Optional[str] = None, status: Optional[str] = None, rule: Optional[str] = None,
+                       before: Optional[int] = None, limit: int = Query(50, ge=1, le=500)):
+    """Newest-first page of finished missions; pass next_before back as ?before= for the next page."""
+    missions, next_before = await asyncio.to_thread(
+        get_store_or_404().list_missions, language, status, rule, before, limit,
+    )
+    return {"missions": missions, "next_before": next_before}
+
+@router.get("/api/history/missions/{mission_id}")
+async def get_history_mission(mission_id: int):
+    mission = await asyncio.to_thread(get_store_or_404().get_mission, mission_id)
+    if mission is None:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    return mission
+
+@router.get("/api/history/missions/{mission_id}/files/{filename:path}")
+async def get_history_file(mission_id: int, filename: str, version: Literal["original", "fixed"] = "original",
+                           if_none_match: Optional[str] = Header(None)):
+    content = await asyncio.to_thread(get_store_or_404().get_file, mission_id, filename, version)
+    if content is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return etag_response(content, content_hash(content), if_none_match, "text/plain; charset=utf-8")
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    # Compresses JSON and file bodies above 1 KB; event streams are left alone
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+    # Serve static files
+    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.include_router(router)
+    return app
 
-@app.get("/api/status")
-async def get_status():
-    return simulation_state
+app = create_app()
@@ -0,0 +1,61 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+class ExecutionBackend:
+    """
+    Runs CPU-bound agent work (scanning, fixing) on behalf of the event loop.
+    The base class is the inline backend: work runs directly on the loop.
+    """
+    name = "inline"
+
+    async def run(self, fn: Callable, *args) -> Any:
+        return fn(*args)
+
+    async def map(self, fn: Callable, items: Iterable[tuple]) -> List[Any]:
+        """Runs fn(*item) for every item in parallel; results keep the input order."""
+        return list(await asyncio.gather(*(self.run(fn, *item) for item in items)))
+
+    def shutdown(self):
+        pass
+
+class ExecutorBackend(ExecutionBackend):
+    """Dispatches work to a concurrent.futures executor, keeping the loop free."""
+    def __init__(self, executor: Executor):
+        self.executor = executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class ThreadBackend(ExecutorBackend):
+    name = "thread"
+
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent"))
+
+class ProcessBackend(ExecutorBackend):
+    """Fans work out across cores. Functions and arguments must be picklable."""
+    name = "process"
+
+    def __init__(self, max_workers: Optional[int] = None):
+        # Imported here: it pulls in multiprocessing, which the other backends never need
+        from concurrent.futures import ProcessPoolExecutor
+        super().__init__(ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()))
+
+BACKENDS = {
+    "inline": ExecutionBackend,
+    "thread": ThreadBackend,
+    "process": ProcessBackend,
+}
+
+def make_backend(name: str, max_workers: Optional[int] = None) -> ExecutionBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown execution backend '{name}' (expected one of {', '.join(BACKENDS)})")
+    if name == "inline":
+        return ExecutionBackend()
+    return BACKENDS[name](max_workers=max_workers)
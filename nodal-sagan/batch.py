@@ -0,0 +1,132 @@
+"""
+Batch scanning of whole source trees, outside the web simulation.
+
+    python batch.py PATH [PATH ...] [--jobs N] [--backend process|thread] [--output FILE]
+
+Findings are written as JSON Lines while the scan runs (one object per
+finding); a throughput summary is printed to stderr at the end.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from agents import language_for_path
+from rules import scan_path
+
+@dataclass
+class FileResult:
+    path: str
+    language: str
+    size: int
+    findings: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    bytes: int = 0
+    findings: int = 0
+    errors: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(self, result: FileResult):
+        self.files += 1
+        self.bytes += result.size
+        self.findings += len(result.findings)
+        self.errors += result.error is not None
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "findings": self.findings,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "files_per_sec": round(self.files / elapsed, 1) if elapsed else 0.0,
+            "mb_per_sec": round(self.bytes / (1024 * 1024) / elapsed, 2) if elapsed else 0.0,
+        }
+
+def iter_source_files(roots: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yields (path, language) for every scannable file under the given files/directories, skipping hidden dirs."""
+    for root in roots:
+        if os.path.isfile(root):
+            language = language_for_path(root)
+            if language:
+                yield root, language
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for filename in sorted(filenames):
+                language = language_for_path(filename)
+                if language:
+                    yield os.path.join(dirpath, filename), language
+
+def scan_file(path: str, language: str) -> FileResult:
+    """Scans one file from disk in bounded memory. Module-level so worker processes can run it."""
+    try:
+        size = os.path.getsize(path)
+        findings = [asdict(f) for f in scan_path(path, language)]
+        return FileResult(path, language, size, findings)
+    except OSError as e:
+        return FileResult(path, language, 0, error=str(e))
+
+def make_executor(backend: str, jobs: Optional[int]) -> Executor:
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=jobs)
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=jobs or os.cpu_count())
+    raise ValueError(f"Unknown backend '{backend}' (expected process or thread)")
+
+def scan_tree(roots: Iterable[str], jobs: Optional[int] = None, backend: str = "process") -> Iterator[FileResult]:
+    """
+    Streams FileResults in completion order. Discovery is lazy and at most
+    a few tasks per worker are in flight, so memory does not grow with the
+    size of the tree.
+    """
+    with make_executor(backend, jobs) as pool:
+        window = 4 * (jobs or os.cpu_count() or 1)
+        pending = set()
+        for path, language in iter_source_files(roots):
+            pending.add(pool.submit(scan_file, path, language))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scan source trees for vulnerabilities and emit JSON Lines findings.")
+    parser.add_argument("paths", nargs="+", help="Files or directories to scan")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Parallel workers (default: CPU count)")
+    parser.add_argument("--backend", choices=["process", "thread"], default="process")
+    parser.add_argument("--output", "-o", help="Write findings here instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    stats = BatchStats()
+    try:
+        for result in scan_tree(args.paths, jobs=args.jobs, backend=args.backend):
+            stats.add(result)
+            if result.error:
+                print(json.dumps({"path": result.path, "error": result.error}), file=sys.stderr)
+            for finding in result.findings:
+                out.write(json.dumps({"path": result.path, **finding}) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps(stats.summary()), file=sys.stderr)
+    return 1 if stats.findings else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Execution backend benchmark: wall-clock time and event-loop latency while a
+batch of files is hacked and fixed under each backend.
+
+Usage: python bench_backends.py [n_files] [file_kb]
+"""
+import asyncio
+import sys
+import time
+
+from agents import fix_file, hack_file
+from backends import make_backend
+from bench_scan import build_corpus
+from mock_github import MockFile
+
+async def _heartbeat(stop: asyncio.Event, lags: list, interval: float = 0.005):
+    """Measures how late the loop wakes a sleeping task; large lags mean a blocked loop."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+async def _run(backend, files):
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    findings = await backend.map(hack_file, [(f,) for f in files])
+    await backend.map(fix_file, [(f, bugs) for f, bugs in zip(files, findings)])
+    wall = time.perf_counter() - start
+    stop.set()
+    await beat
+    return wall, max(lags, default=0.0)
+
+def main(n_files: int = 32, file_kb: int = 512):
+    languages = ["python", "javascript", "abap", "java", "go", "ruby"]
+    files = [
+        MockFile(f"file_{i}", build_corpus(languages[i % 6], file_kb * 1024), languages[i % 6])
+        for i in range(n_files)
+    ]
+    results = []
+    for name in ["inline", "thread", "process"]:
+        backend = make_backend(name)
+        asyncio.run(_run(backend, files[:2]))  # warm up pools
+        results.append((name,) + asyncio.run(_run(backend, files)))
+        backend.shutdown()
+    print(f"{n_files} files x {file_kb} KB")
+    print(f"{'backend':<10}{'wall s':>10}{'max loop lag ms':>18}")
+    for name, wall, lag in results:
+        print(f"{name:<10}{wall:>10.3f}{lag * 1000:>18.1f}")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
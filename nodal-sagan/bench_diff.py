@@ -0,0 +1,35 @@
+"""
+Diff-aware scan benchmark: full-file scan vs. scanning only the changed hunk
+of a large file in which one line was edited. The diff is supplied up front,
+as a code host would provide it; computing it locally with difflib is timed
+separately.
+
+Usage: python bench_diff.py
+"""
+import time
+
+from bench_scan import _time, build_corpus
+from diffscan import scan_changes
+from mock_github import MockFile
+from rules import scan_content
+
+def main():
+    print(f"{'size MB':>8}{'full ms':>10}{'diff ms':>10}{'difflib ms':>12}")
+    for size_mb in [1, 4, 16]:
+        base = build_corpus("python", size_mb * 1024 * 1024)
+        lines = base.split("\n")
+        lines[len(lines) // 3] = "result = eval(user_input)"
+        content = "\n".join(lines)
+
+        start = time.perf_counter()
+        diff = MockFile("app.py", content, "python", base_content=base).unified_diff()
+        difflib_ms = (time.perf_counter() - start) * 1000
+
+        file = MockFile("app.py", content, "python", base_content=base, diff=diff)
+        assert {f.rule_id for f in scan_changes(file)} >= {"py-eval-rce"}
+        full_ms = _time(lambda: scan_content(content, "python")) * 1000
+        diff_ms = _time(lambda: scan_changes(file)) * 1000
+        print(f"{size_mb:>8}{full_ms:>10.2f}{diff_ms:>10.2f}{difflib_ms:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Remediation benchmark: table-driven fix engine vs. the original substring
+ladder, in fixes/sec on small snippets and in MB/s on large files.
+
+Usage: python bench_fix.py [size_mb]
+"""
+import re
+import sys
+
+from agents import FixerAgent, VulnerabilityFactory
+from bench_scan import _time, build_corpus
+from mock_github import MockFile
+from rules import scan_content
+
+def legacy_fix(file: MockFile, vulnerability: str) -> str:
+    """The original FixerAgent.fix ladder, kept as the parity/benchmark reference."""
+    content = file.content
+    
+    # Python
+    if file.language == "python":
+        if "Password" in vulnerability:
+            content = re.sub(r'password\s*=\s*".*"', 'password = os.getenv("PASSWORD")', content) 
+            if "import os" not in content: content = "import os\n" + content
+        if "Remote Code Execution" in vulnerability:
+             content = content.replace("eval(", "ast.literal_eval(")
+             if "import ast" not in content: content = "import ast\n" + content
+        if "SQL Injection" in vulnerability:
+             content = content.replace('f"SELECT * FROM users WHERE id = {uid}"', '"SELECT * FROM users WHERE id = ?", (uid,)')
+    
+    # JavaScript
+    elif file.language == "javascript":
+         if "XSS" in vulnerability:
+             content = content.replace("innerHTML =", "textContent =")
+         if "Password" in vulnerability:
+             content = re.sub(r'password:\s*".*"', 'password: process.env.DB_PASSWORD', content)
+         if "Path Traversal" in vulnerability:
+             content = content.replace('req.params.id', 'path.basename(req.params.id)')
+
+    # ABAP
+    elif file.language == "abap":
+         if "SQL" in vulnerability:
+             content = content.replace("EXEC SQL", "-- Secured with Open SQL")
+             content += "\n* Fixed by Agent: Replaced Dynamic SQL with Open SQL"
+         if "Unauthorized" in vulnerability:
+             content = 'AUTHORITY-CHECK OBJECT \'S_TCODE\' ID \'TCD\' FIELD \'Z_AUTH\'.\nIF sy-subrc = 0.\n  ' + content + '\nENDIF.'
+
+    # Java
+    elif file.language == "java":
+         if "SQL Injection" in vulnerability:
+              content = content.replace('" + userId', '?"'); 
+              content = content.replace("statement.executeQuery(query)", "statement.prepareStatement(query, userId).executeQuery()")
+         if "Log" in vulnerability:
+              # Simple replace to ensure ESAPI is present for the scanner
+              content = content.replace("logger.info", "logger.info(ESAPI.encoder().encodeForHTML")
+
+    # Go
+    elif file.language == "go":
+         if "SQL Injection" in vulnerability:
+              content = content.replace('fmt.Sprintf("SELECT * FROM users WHERE id = %s", id)', '"SELECT * FROM users WHERE id = ?", id')
+         if "Root Shell" in vulnerability:
+              content = content.replace('exec.Command("sh", "-c", cmd)', '// Validate input first\n    if isValid(cmd) { exec.Command(cmd) }')
+
+    # Ruby
+    elif file.language == "ruby":
+         if "Command Injection" in vulnerability:
+              content = content.replace('system("echo " + cmd)', 'system("echo", cmd) # Safe arg passing')
+         if "API Key" in vulnerability:
+              # Use simple replace for robustness
+              content = content.replace('API_KEY = "12345-abcde"', 'API_KEY = ENV["API_KEY"]')
+
+    return content
+
+def legacy_fix_all(file: MockFile, vulnerabilities) -> str:
+    """The original fix_file: one full pass over the content per finding."""
+    content = file.content
+    for bug in vulnerabilities:
+        content = legacy_fix(MockFile(file.filename, content, file.language), bug)
+    return content
+
+def main(size_mb: float = 1.0):
+    factory = VulnerabilityFactory()
+    fixer = FixerAgent()
+
+    print(f"{'language':<12}{'ladder fixes/s':>16}{'engine fixes/s':>16}")
+    rounds = 2000
+    for language in ["python", "javascript", "abap", "java", "go", "ruby"]:
+        cases = []
+        for _, content in factory.snippets[language]:
+            file = MockFile("f", content, language)
+            cases.append((file, [f.message for f in scan_content(content, language)]))
+        n_fixes = rounds * sum(len(bugs) for _, bugs in cases)
+        ladder = _time(lambda: [legacy_fix_all(f, b) for _ in range(rounds) for f, b in cases], repeat=3)
+        engine = _time(lambda: [fixer.fix_findings(f, b) for _ in range(rounds) for f, b in cases], repeat=3)
+        print(f"{language:<12}{n_fixes / ladder:>16.0f}{n_fixes / engine:>16.0f}")
+
+    size = int(size_mb * 1024 * 1024)
+    print()
+    print(f"{'language':<12}{'ladder MB/s':>14}{'engine MB/s':>14}{'edits':>7}")
+    for language in ["python", "javascript", "abap", "java", "go", "ruby"]:
+        # Every rule of the language fires somewhere in the file
+        content = build_corpus(language, size) + "\n".join(c for _, c in factory.snippets[language])
+        file = MockFile("f", content, language)
+        bugs = [f.message for f in scan_content(content, language)]
+        mb = len(content) / (1024 * 1024)
+        ladder = _time(lambda: legacy_fix_all(file, bugs), repeat=3)
+        engine = _time(lambda: fixer.fix_findings(file, bugs), repeat=3)
+        edits = len(fixer.fix_findings(file, bugs).edits)
+        print(f"{language:<12}{mb / ladder:>14.1f}{mb / engine:>14.1f}{edits:>7}")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
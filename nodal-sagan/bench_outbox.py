@@ -0,0 +1,59 @@
+"""
+Code-host round-trip benchmark: direct writes vs the outbox.
+
+    python bench_outbox.py [--missions N] [--files F] [--density D] [--latency MS] [--seed S]
+
+Runs the same seeded missions twice against a SlowGitHub that sleeps for
+--latency on every write, once writing straight to it and once through an
+Outbox, and reports round-trips and end-to-end latency per mission.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from agents import SupervisorAgent, VulnerabilityFactory
+from bench_pipeline import LANGUAGES, percentiles
+from mock_github import MockFile, SlowGitHub
+from outbox import Outbox
+from pacing import Pacing
+
+async def _noop_log(message: str, **fields):
+    pass
+
+async def run(missions: int, n_files: int, density: float, latency: float, seed: int,
+              use_outbox: bool) -> Dict[str, Any]:
+    github = SlowGitHub(latency=latency)
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), outbox=Outbox(github) if use_outbox else None)
+    latencies: List[float] = []
+    for language, files in VulnerabilityFactory(seed).iter_prs(missions, LANGUAGES, n_files=n_files, density=density):
+        pr = github.create_pr("bench", [MockFile(name, content, language) for name, content in files])
+        start = time.perf_counter()
+        await supervisor.run_mission(pr.id, _noop_log)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "round_trips_per_mission": round(github.round_trips / missions, 2),
+        "latency": percentiles(latencies),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare code-host round-trips with and without the outbox.")
+    parser.add_argument("--missions", type=int, default=50)
+    parser.add_argument("--files", type=int, default=10, help="Files per synthetic PR")
+    parser.add_argument("--density", type=float, default=0.3, help="Fraction of files that are vulnerable")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected latency per host write, in ms")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, use_outbox in [("direct", False), ("outbox", True)]:
+        results[name] = asyncio.run(run(
+            args.missions, args.files, args.density, args.latency / 1000, args.seed, use_outbox,
+        ))
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
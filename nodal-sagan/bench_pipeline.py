@@ -0,0 +1,225 @@
+"""
+Mission pipeline benchmark and load test.
+
+    python bench_pipeline.py [--missions N] [--concurrency C] [--files F] [--file-kb K]
+                             [--density D] [--seed S] [--backend NAME] [--http]
+                             [--output FILE] [--compare FILE]
+
+Synthetic PRs come from a seeded VulnerabilityFactory, so two runs with the
+same arguments scan exactly the same code. The in-process run drives
+SupervisorAgent.run_mission directly and reports scan, fix and validation
+throughput plus end-to-end latency percentiles; --http also starts the API on
+a local port and measures mission latency seen by concurrent HTTP clients.
+Results are written as JSON; --compare prints the change against an earlier
+results file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from agents import SupervisorAgent, VulnerabilityFactory
+from backends import make_backend
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p90/p99 plus mean and max, in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+    return {
+        "p50_ms": round(rank(50) * 1000, 3),
+        "p90_ms": round(rank(90) * 1000, 3),
+        "p99_ms": round(rank(99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+def _rate(amount: float, seconds: float) -> float:
+    return round(amount / seconds, 2) if seconds else 0.0
+
+async def run_in_process(missions: int, concurrency: int, n_files: int, file_size: int, density: float,
+                         seed: int, backend: str = "inline") -> Dict[str, Any]:
+    prs = [
+        [MockFile(name, content, language) for name, content in files]
+        for language, files in VulnerabilityFactory(seed).iter_prs(
+            missions, LANGUAGES, n_files=n_files, file_size=file_size, density=density,
+        )
+    ]
+    github = MockGitHub()
+    supervisor = SupervisorAgent(github, backend=make_backend(backend), pacing=Pacing("throughput"))
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(files: List[MockFile]):
+        async with gate:
+            pr = github.create_pr("bench", files)
+            start = time.perf_counter()
+            result = await supervisor.run_mission(pr.id, _noop_log)
+            return time.perf_counter() - start, result, pr.id
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(files) for files in prs))
+    wall = time.perf_counter() - start
+    supervisor.backend.shutdown()
+
+    scanned_bytes = sum(len(f.content) for files in prs for f in files)
+    work = {phase: 0.0 for phase in ["hack", "fix", "validate"]}
+    fixed_files = findings = validated_bytes = 0
+    for _, result, _ in outcomes:
+        for phase in work:
+            work[phase] += result["timings"].get(phase, {}).get("work", 0.0)
+        fixed_files += len(result["fixes"])
+        findings += sum(len(messages) for messages in result["findings"].values())
+        # Validation re-scans only the files patched in each round
+        validated_bytes += result.get("validation", {}).get("rescanned_bytes", 0)
+    mb = 1024 * 1024
+    return {
+        "missions": missions,
+        "files": missions * n_files,
+        "findings": findings,
+        "fixed_files": fixed_files,
+        "wall_s": round(wall, 3),
+        "missions_per_s": _rate(missions, wall),
+        "scan_mb_per_s": _rate(scanned_bytes / mb, work["hack"]),
+        "fix_files_per_s": _rate(fixed_files, work["fix"]),
+        "validate_mb_per_s": _rate(validated_bytes / mb, work["validate"]),
+        "latency": percentiles(latency for latency, _, _ in outcomes),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def run_http(missions: int, concurrency: int, n_files: int, file_size: int, density: float, seed: int,
+             poll_interval: float = 0.01, timeout: float = 60.0) -> Dict[str, Any]:
+    """Runs missions through a local API server, `concurrency` clients at a time."""
+    import requests
+    import uvicorn
+    from app import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    base = f"http://127.0.0.1:{port}"
+
+    rejected = []
+    def one(i: int) -> Optional[float]:
+        session = requests.Session()
+        start = time.perf_counter()
+        while True:
+            response = session.post(f"{base}/api/missions", json={
+                "language": LANGUAGES[i % len(LANGUAGES)], "pacing": "throughput",
+                "files": n_files, "file_size": file_size, "density": density, "seed": seed + i,
+            })
+            if response.status_code != 429:
+                break
+            rejected.append(i)
+            time.sleep(float(response.headers.get("Retry-After", "1")))
+        response.raise_for_status()
+        mission_id = response.json()["mission_id"]
+        while time.perf_counter() - start < timeout:
+            state = session.get(f"{base}/api/missions/{mission_id}").json()
+            if state["status"] in ("COMPLETED", "ERROR"):
+                return time.perf_counter() - start if state["status"] == "COMPLETED" else None
+            time.sleep(poll_interval)
+        return None
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            latencies = list(clients.map(one, range(missions)))
+        wall = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    completed = [latency for latency in latencies if latency is not None]
+    return {
+        "missions": missions,
+        "completed": len(completed),
+        "failed": missions - len(completed),
+        "rejected_429": len(rejected),
+        "wall_s": round(wall, 3),
+        "missions_per_s": _rate(len(completed), wall),
+        "latency": percentiles(completed),
+    }
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """One line per metric present in both results: old, new and relative change."""
+    old, new = _flatten(baseline["results"]), _flatten(current["results"])
+    lines = []
+    for key in sorted(old.keys() & new.keys()):
+        change = f"{(new[key] - old[key]) / old[key] * 100:+.1f}%" if old[key] else "n/a"
+        lines.append(f"{key:<40}{old[key]:>14}{new[key]:>14}{change:>10}")
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark and load-test the mission pipeline.")
+    parser.add_argument("--missions", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--files", type=int, default=50, help="Files per synthetic PR")
+    parser.add_argument("--file-kb", type=int, default=16, help="Approximate size of each file")
+    parser.add_argument("--density", type=float, default=0.2, help="Fraction of files that are vulnerable")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=["inline", "thread", "process"], default="inline")
+    parser.add_argument("--http", action="store_true", help="Also load-test the HTTP API")
+    parser.add_argument("--output", "-o", default="bench_pipeline.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {}
+    results["in_process"] = asyncio.run(run_in_process(
+        args.missions, args.concurrency, args.files, args.file_kb * 1024, args.density, args.seed, args.backend,
+    ))
+    if args.http:
+        results["http"] = run_http(
+            args.missions, args.concurrency, args.files, args.file_kb * 1024, args.density, args.seed,
+        )
+
+    report = {
+        "config": vars(args),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "timestamp": time.time(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n{'metric':<40}{'baseline':>14}{'current':>14}{'change':>10}")
+        print("\n".join(compare(baseline, report)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Remediation benchmark: time spent in the fix phase for PRs of hundreds of
+files with a fixed number of vulnerable ones, compared with the previous
+loop that patched every file for every finding.
+
+Usage: python bench_remediation.py [vulnerable_files]
+"""
+import asyncio
+import sys
+import time
+
+from agents import FixerAgent, SupervisorAgent, VulnerabilityFactory
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def build_pr_files(n_files: int, n_vulnerable: int):
+    factory = VulnerabilityFactory()
+    safe = factory.snippets["safe"]["python"]
+    vulns = factory.snippets["python"]
+    files = []
+    for i in range(n_files):
+        if i < n_vulnerable:
+            content = vulns[i % len(vulns)][1]
+        else:
+            content = safe[i % len(safe)][1]
+        files.append(MockFile(f"module_{i}.py", content, "python"))
+    return files
+
+def legacy_remediation(files, vulnerabilities):
+    """The previous remediation loop: every finding applied to every file."""
+    fixer = FixerAgent()
+    fixes, tests = [], []
+    for file in files:
+        current_content = file.content
+        for bug in vulnerabilities:
+            current_content = fixer.fix(
+                MockFile(filename=file.filename, content=current_content, language=file.language), bug
+            )
+            tests.append(fixer.generate_security_test(bug, file.language))
+        fixes.append({"filename": file.filename, "content": current_content})
+    return fixes, tests
+
+def main(n_vulnerable: int = 10):
+    print(f"{'files':>6}{'findings':>10}{'legacy ms':>12}{'fix ms':>10}{'legacy tests':>14}{'tests':>7}")
+    for n_files in [100, 300, 1000]:
+        github = MockGitHub()
+        pr = github.create_pr("bench", build_pr_files(n_files, n_vulnerable))
+        supervisor = SupervisorAgent(github, pacing=Pacing("throughput"))
+        result = asyncio.run(supervisor.run_mission(pr.id, _noop_log))
+
+        start = time.perf_counter()
+        _, legacy_tests = legacy_remediation(build_pr_files(n_files, n_vulnerable), result["vulnerabilities"])
+        legacy_ms = (time.perf_counter() - start) * 1000
+        fix_ms = result["timings"]["fix"]["work"] * 1000
+        print(f"{n_files:>6}{len(result['vulnerabilities']):>10}{legacy_ms:>12.1f}{fix_ms:>10.1f}"
+              f"{len(legacy_tests):>14}{len(result['tests']):>7}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,80 @@
+"""
+Scan benchmark: compiled rule engine vs. the original if/elif ladder.
+
+Usage: python bench_scan.py [size_mb]
+"""
+import re
+import sys
+import time
+from typing import List
+
+from agents import VulnerabilityFactory
+from rules import scan_content
+
+def legacy_hack(c: str, language: str) -> List[str]:
+    """The original HackerAgent.hack ladder, kept as the parity/benchmark reference."""
+    vulnerabilities = []
+    if language == "python":
+        if re.search(r'password\s*=\s*"', c) and 'os.getenv' not in c:
+            vulnerabilities.append("Exploit Successful: Extracted Admin Password")
+        if "eval(" in c and "ast.literal_eval" not in c:
+            vulnerabilities.append("Exploit Successful: Remote Code Execution via eval()")
+        if "SELECT * FROM" in c and "f\"" in c and "?" not in c:
+            vulnerabilities.append("Exploit Successful: SQL Injection via f-string")
+    elif language == "javascript":
+        if "innerHTML =" in c:
+            vulnerabilities.append("Exploit Successful: Stored XSS Payload in DOM")
+        if ("password:" in c) and 'process.env' not in c:
+            vulnerabilities.append("Exploit Successful: Leaked DB Password")
+        if "res.sendFile" in c and "path.basename" not in c:
+            vulnerabilities.append("Exploit Successful: Path Traversal /etc/passwd")
+    elif language == "abap":
+        if "EXEC SQL" in c:
+            vulnerabilities.append("Exploit Successful: Dropped Table via Dynamic SQL")
+        if "SELECT * FROM" in c and "AUTHORITY-CHECK" not in c:
+            vulnerabilities.append("Exploit Successful: Unauthorized Data Access")
+    elif language == "java":
+        if "SELECT * FROM" in c and "+" in c and "?" not in c:
+            vulnerabilities.append("Exploit Successful: SQL Injection via String Concatenation")
+        if "logger.info" in c and "ESAPI" not in c:
+            vulnerabilities.append("Exploit Successful: Forged Log Entries")
+    elif language == "go":
+        if "SELECT * FROM" in c and "fmt.Sprintf" in c:
+            vulnerabilities.append("Exploit Successful: SQL Injection via Sprintf")
+        if "exec.Command" in c and "sh" in c and "isValid" not in c:
+            vulnerabilities.append("Exploit Successful: Root Shell obtained")
+    elif language == "ruby":
+        if "system(" in c and "Safe arg" not in c:
+            vulnerabilities.append("Exploit Successful: Server Hijacked via Command Injection")
+        if "API_KEY =" in c and "ENV[" not in c:
+            vulnerabilities.append("Exploit Successful: Stolen API Key")
+    return vulnerabilities
+
+def build_corpus(language: str, size: int) -> str:
+    """Safe code padded to `size` characters with one vulnerable snippet in the middle."""
+    factory = VulnerabilityFactory()
+    safe = "\n".join(content for _, content in factory.snippets["safe"][language]) + "\n"
+    half = safe * (size // (2 * len(safe)) + 1)
+    return half + factory.snippets[language][0][1] + "\n" + half
+
+def _time(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(size_mb: float = 1.0):
+    size = int(size_mb * 1024 * 1024)
+    print(f"{'language':<12}{'ladder ms/MB':>14}{'engine ms/MB':>14}{'hits':>6}")
+    for language in ["python", "javascript", "abap", "java", "go", "ruby"]:
+        content = build_corpus(language, size)
+        mb = len(content) / (1024 * 1024)
+        ladder = _time(lambda: legacy_hack(content, language)) * 1000 / mb
+        engine = _time(lambda: scan_content(content, language)) * 1000 / mb
+        hits = len(scan_content(content, language))
+        print(f"{language:<12}{ladder:>14.2f}{engine:>14.2f}{hits:>6}")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,75 @@
+"""
+Cold-start benchmark for the API.
+
+    python bench_startup.py [--runs N] [--module app]
+
+Each run starts a fresh interpreter, so nothing is shared between runs:
+  import     time to `import app` (or --module), measured inside the child
+  first_status  time from spawning `uvicorn app:app` to the first 200 from
+             /api/status, i.e. what an autoscaled worker costs before it
+             can serve.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from bench_pipeline import percentiles
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_PROBE = "import sys, time; t = time.perf_counter(); import {module}; sys.stdout.write(str(time.perf_counter() - t))"
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def time_import(module: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+        cwd=HERE, check=True, capture_output=True, text=True,
+    )
+    return float(out.stdout)
+
+def time_first_status(module: str, timeout: float = 30.0) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/status"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "error"],
+        cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError(f"{url} did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def run(runs: int, module: str) -> Dict[str, Any]:
+    imports: List[float] = [time_import(module) for _ in range(runs)]
+    first: List[float] = [time_first_status(module) for _ in range(runs)]
+    return {"runs": runs, "import": percentiles(imports), "first_status": percentiles(first)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure app import time and time to first /api/status response.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="app")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.runs, args.module), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
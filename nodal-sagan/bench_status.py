@@ -0,0 +1,59 @@
+"""
+Status payload benchmark: bytes per dashboard poll for the old full state,
+the hash summary, and both gzip-compressed, for finished missions of
+growing size.
+
+Usage: python bench_status.py
+"""
+import asyncio
+import gzip
+import json
+
+from agents import SupervisorAgent, VulnerabilityFactory
+from app import new_simulation_state, render_state
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+from payloads import describe_files, describe_tests, summarize_state
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def finished_state(n_files: int, file_size: int) -> dict:
+    """A completed mission state, filled in the way run_simulation_task does."""
+    files = VulnerabilityFactory(1).generate_pr("python", n_files, file_size, density=0.5)
+    github = MockGitHub()
+    pr = github.create_pr("bench", [MockFile(name, content, "python") for name, content in files])
+    result = asyncio.run(SupervisorAgent(github, pacing=Pacing("throughput")).run_mission(pr.id, _noop_log))
+    state = new_simulation_state()
+    state.update({
+        "status": "COMPLETED",
+        "pr_details": {"id": pr.id, "title": pr.title, "status": pr.status, "files": dict(files)},
+        "vulnerabilities": result["vulnerabilities"],
+        "fixed_code": {fix["filename"]: fix["content"] for fix in result["fixes"]},
+        "generated_tests": result["tests"],
+        "timings": result["timings"],
+    })
+    state["digests"] = {
+        "files": describe_files(state["pr_details"]["files"]),
+        "fixed_code": describe_files(state["fixed_code"]),
+        "generated_tests": describe_tests(state["generated_tests"]),
+    }
+    for i in range(40):
+        state["logs"].append(f"log line {i}")
+    return state
+
+def _sizes(view: dict):
+    body = json.dumps(view).encode()
+    return len(body), len(gzip.compress(body, compresslevel=6))
+
+def main():
+    print(f"{'files':>6}{'file KB':>9}{'full B':>12}{'full gz B':>12}{'summary B':>12}{'summary gz B':>14}")
+    for n_files, file_kb in [(3, 0), (20, 4), (100, 16)]:
+        state = finished_state(n_files, file_kb * 1024)
+        # A poll after the first one only asks for new log lines
+        full, full_gz = _sizes(render_state(state, since=state["logs"].total))
+        summary, summary_gz = _sizes(summarize_state(state, since=state["logs"].total))
+        print(f"{n_files:>6}{file_kb:>9}{full:>12}{full_gz:>12}{summary:>12}{summary_gz:>14}")
+
+if __name__ == "__main__":
+    main()
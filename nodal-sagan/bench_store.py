@@ -0,0 +1,69 @@
+"""
+Mission store benchmark: write throughput, startup time and history query
+latency as the store grows to 100k+ missions.
+
+Usage: python bench_store.py [missions] [path]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from agents import VulnerabilityFactory
+from bench_scan import _time
+from rules import scan_content
+from store import MissionRecord, MissionStore
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+def synthetic_records(count: int, start_id: int = 1):
+    """Missions shaped like real ones: a few small files, findings on the vulnerable ones."""
+    factory = VulnerabilityFactory(1)
+    for i, (language, files) in enumerate(factory.iter_prs(count, LANGUAGES, n_files=3, density=0.5)):
+        findings = {}
+        for name, content in files:
+            messages = [f.message for f in scan_content(content, language)]
+            if messages:
+                findings[name] = messages
+        yield MissionRecord(
+            id=start_id + i, title=f"Feature: Update {language} service", language=language,
+            status="COMPLETED", pr_status="MERGED" if findings else "OPEN", files=dict(files),
+            findings=findings, checks={"Security Check": "PASS"}, comments=["Security Breach"] * len(findings),
+        )
+
+def main(count: int = 100_000, path: str = ""):
+    path = path or os.path.join(tempfile.mkdtemp(), "missions.db")
+    store = MissionStore(path)
+    start, batch = time.perf_counter(), []
+    for record in synthetic_records(count):
+        batch.append(record)
+        if len(batch) == 1000:
+            store.record_missions(batch)
+            batch = []
+    store.record_missions(batch)
+    write = time.perf_counter() - start
+    store.close()
+
+    start = time.perf_counter()
+    store = MissionStore(path)
+    last = store.last_mission_id()
+    startup = time.perf_counter() - start
+
+    print(f"{count} missions, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+    print(f"write           {count / write:>10.0f} missions/s")
+    print(f"startup         {startup * 1000:>10.2f} ms (last id {last})")
+    _, cursor = store.list_missions(limit=50)
+    queries = {
+        "first page": lambda: store.list_missions(limit=50),
+        "deep page": lambda: store.list_missions(before=count // 2, limit=50),
+        "by language": lambda: store.list_missions(language="go", limit=50),
+        "by status": lambda: store.list_missions(status="ERROR", limit=50),
+        "by rule": lambda: store.list_missions(rule_id="go-command-injection", limit=50),
+        "detail": lambda: store.get_mission(count // 3),
+        "single write": lambda: store.record_mission(next(synthetic_records(1, store.last_mission_id() + 1))),
+    }
+    for name, query in queries.items():
+        print(f"{name:<16}{_time(query, repeat=20) * 1000:>10.3f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000, sys.argv[2] if len(sys.argv) > 2 else "")
@@ -0,0 +1,51 @@
+"""
+Streaming scan benchmark: peak RSS and time for the in-memory and chunked
+scan paths on one large generated file. Each mode runs in a fresh process
+so ru_maxrss reflects that mode alone.
+
+Usage: python bench_stream.py [size_mb]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_scan import build_corpus
+
+CHILD = """
+import resource, sys, time
+from rules import scan_content, scan_path
+mode, path = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if mode == "memory":
+    with open(path, encoding="utf-8", newline="") as f:
+        findings = scan_content(f.read(), "python")
+else:
+    findings = scan_path(path, "python")
+elapsed = time.perf_counter() - start
+print(len(findings), elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def main(size_mb: int = 64):
+    # Write the corpus a megabyte at a time: on Linux a child's ru_maxrss starts
+    # from the parent's RSS at fork, so the parent must stay small too
+    block = build_corpus("python", 1024 * 1024)
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        for _ in range(size_mb):
+            f.write(block)
+        path = f.name
+    try:
+        here = os.path.dirname(os.path.abspath(__file__))
+        print(f"{size_mb} MB file")
+        print(f"{'mode':<8}{'findings':>10}{'seconds':>10}{'peak RSS MB':>14}")
+        for mode in ["memory", "stream"]:
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, mode, path], cwd=here, capture_output=True, text=True, check=True
+            ).stdout.split()
+            findings, seconds, rss_kb = int(out[0]), float(out[1]), int(out[2])
+            print(f"{mode:<8}{findings:>10}{seconds:>10.3f}{rss_kb / 1024:>14.1f}")
+    finally:
+        os.unlink(path)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
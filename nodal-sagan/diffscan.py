@@ -0,0 +1,107 @@
+import bisect
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mock_github import MockFile
+from rules import Finding, RuleObserver, scan_content
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+# Unchanged lines scanned on each side of a hunk
+DEFAULT_CONTEXT = 3
+
+def changed_line_ranges(diff: str, context: int, total_lines: int) -> List[Tuple[int, int]]:
+    """
+    1-based, inclusive line ranges of the new file touched by `diff`, widened
+    by `context` lines on each side and merged where they overlap. A pure
+    deletion contributes the lines around the point where text was removed.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for m in HUNK_HEADER.finditer(diff):
+        start, count = int(m.group(1)), int(m.group(2) or 1)
+        if count == 0:
+            # Deletion: the header points at the line *before* the removed text
+            first, last = start + 1, start
+        else:
+            first, last = start, start + count - 1
+        first, last = max(1, first - context), min(total_lines, last + context)
+        if first > last:
+            continue
+        if ranges and first <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], last))
+        else:
+            ranges.append((first, last))
+    return ranges
+
+def _line_starts(content: str, line_numbers: List[int], block: int = 1 << 16) -> Dict[int, int]:
+    """
+    Offsets where the given 1-based lines (sorted ascending) begin. Newlines
+    are counted a block at a time with str.count, so reaching a line deep in
+    a large file costs a C-speed pass rather than splitting the whole file.
+    Lines past the end map to len(content).
+    """
+    starts: Dict[int, int] = {}
+    line, pos = 1, 0  # `pos` lies on line `line`; it is that line's start whenever line == target
+    for target in line_numbers:
+        while line < target:
+            n = content.count("\n", pos, pos + block)
+            if line + n < target and pos + block < len(content):
+                line, pos = line + n, pos + block
+                continue
+            while line < target:
+                nl = content.find("\n", pos)
+                if nl == -1:
+                    pos, line = len(content), target
+                    break
+                line, pos = line + 1, nl + 1
+        starts[target] = pos
+    return starts
+
+def scan_changes(file: MockFile, context: int = DEFAULT_CONTEXT, observe: Optional[RuleObserver] = None,
+                 on_scanned: Optional[Callable[[int], None]] = None) -> List[Finding]:
+    """
+    Scans only the changed hunks of `file` (plus `context` lines around each)
+    and maps findings back to offsets and line numbers in the full file.
+    Files without a base revision are new and are scanned in full. Since only
+    the changed region is scanned, a rule's forbidden atoms are also only
+    looked for there. `on_scanned` is called with the number of characters
+    actually scanned.
+    """
+    if file.base_content is None:
+        if on_scanned:
+            on_scanned(len(file.content))
+        return scan_content(file.content, file.language, observe)
+
+    content = file.content
+    ranges = changed_line_ranges(file.unified_diff(), context, content.count("\n") + 1)
+    if not ranges:
+        if on_scanned:
+            on_scanned(0)
+        return []
+
+    starts = _line_starts(content, sorted({n for first, last in ranges for n in (first, last + 1)}))
+    parts: List[str] = []
+    # Per scanned segment: (offset in region, offset in file, first line in region, first line in file)
+    segments: List[Tuple[int, int, int, int]] = []
+    region_offset, region_line = 0, 1
+    for first, last in ranges:
+        text = content[starts[first]:starts[last + 1]]
+        segments.append((region_offset, starts[first], region_line, first))
+        parts.append(text)
+        region_offset += len(text)
+        region_line += last - first + 1
+
+    if on_scanned:
+        on_scanned(region_offset)
+    region_starts = [segment[0] for segment in segments]
+    findings = []
+    for f in scan_content("".join(parts), file.language, observe):
+        seg_region_offset, seg_file_offset, seg_region_line, seg_file_line = \
+            segments[bisect.bisect_right(region_starts, f.offset) - 1]
+        findings.append(Finding(
+            f.rule_id, f.language, f.message,
+            offset=seg_file_offset + (f.offset - seg_region_offset),
+            line=seg_file_line + (f.line - seg_region_line),
+            column=f.column,
+        ))
+    return findings
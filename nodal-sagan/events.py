@@ -0,0 +1,57 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+TERMINAL_STATUSES = ("COMPLETED", "ERROR")
+
+class ChangeFeed:
+    """
+    Wakes up every stream watching a mission whenever its state changes.
+    Waiters grab the current event *before* reading state, so a change made
+    between the read and the wait is never missed.
+    """
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def changed(self) -> asyncio.Event:
+        return self._event
+
+    def notify(self):
+        self._event.set()
+        self._event = asyncio.Event()
+
+def format_sse(event: str, data, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+async def event_stream(state: dict, feed: ChangeFeed, offset: int = 0, keepalive: float = 15.0) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for one mission: a `log` event per log record (its SSE
+    id is seq + 1, so reconnecting clients resume via Last-Event-ID), a
+    `state` event on every status/step transition, and a final `end` event.
+    """
+    last_state = None
+    while True:
+        changed = feed.changed()
+
+        for record in state["logs"].since(offset):
+            yield format_sse("log", record.format(), event_id=record.seq + 1)
+            offset = record.seq + 1
+
+        current = {"status": state["status"], "current_step": state["current_step"]}
+        if current != last_state:
+            yield format_sse("state", current)
+            last_state = current
+
+        if state["status"] in TERMINAL_STATUSES:
+            yield format_sse("end", current)
+            return
+
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=keepalive)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
@@ -0,0 +1,130 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from rules import RULE_IDS_BY_MESSAGE, Atom
+
+@dataclass(frozen=True)
+class FixRule:
+    """
+    Remediation for one detection rule (keyed by its stable rule id).
+    Every `replacements` pattern is rewritten in place; `prefix`/`suffix`
+    are inserted at the start/end of the file, the prefix only if
+    `prefix_unless` does not already occur in it.
+    """
+    rule_id: str
+    replacements: Tuple[Tuple[Atom, str], ...] = ()
+    prefix: str = ""
+    prefix_unless: str = ""
+    suffix: str = ""
+
+@dataclass(frozen=True)
+class Edit:
+    """Replace content[start:end] of the original file with `text`; start == end is an insertion."""
+    start: int
+    end: int
+    text: str
+
+@dataclass
+class FixResult:
+    content: str
+    edits: List[Edit]
+
+FIX_RULES: Dict[str, FixRule] = {fix.rule_id: fix for fix in [
+    # Python
+    FixRule("py-hardcoded-password",
+            replacements=((re.compile(r'password\s*=\s*".*"'), 'password = os.getenv("PASSWORD")'),),
+            prefix="import os\n", prefix_unless="import os"),
+    FixRule("py-eval-rce",
+            replacements=(("eval(", "ast.literal_eval("),),
+            prefix="import ast\n", prefix_unless="import ast"),
+    FixRule("py-sqli-fstring",
+            replacements=(('f"SELECT * FROM users WHERE id = {uid}"', '"SELECT * FROM users WHERE id = ?", (uid,)'),)),
+    # JavaScript
+    FixRule("js-xss-innerhtml", replacements=(("innerHTML =", "textContent ="),)),
+    FixRule("js-hardcoded-password",
+            replacements=((re.compile(r'password:\s*".*"'), "password: process.env.DB_PASSWORD"),)),
+    FixRule("js-path-traversal", replacements=(("req.params.id", "path.basename(req.params.id)"),)),
+    # ABAP
+    FixRule("abap-dynamic-sql",
+            replacements=(("EXEC SQL", "-- Secured with Open SQL"),),
+            suffix="\n* Fixed by Agent: Replaced Dynamic SQL with Open SQL"),
+    FixRule("abap-missing-authority-check",
+            prefix="AUTHORITY-CHECK OBJECT 'S_TCODE' ID 'TCD' FIELD 'Z_AUTH'.\nIF sy-subrc = 0.\n  ",
+            suffix="\nENDIF."),
+    # Java
+    FixRule("java-sqli-concat",
+            replacements=(('" + userId', '?"'),
+                          ("statement.executeQuery(query)", "statement.prepareStatement(query, userId).executeQuery()"))),
+    # Ensures ESAPI is present for the scanner
+    FixRule("java-log-injection", replacements=(("logger.info", "logger.info(ESAPI.encoder().encodeForHTML"),)),
+    # Go
+    FixRule("go-sqli-sprintf",
+            replacements=(('fmt.Sprintf("SELECT * FROM users WHERE id = %s", id)', '"SELECT * FROM users WHERE id = ?", id'),)),
+    FixRule("go-command-injection",
+            replacements=(('exec.Command("sh", "-c", cmd)', "// Validate input first\n    if isValid(cmd) { exec.Command(cmd) }"),)),
+    # Ruby
+    FixRule("rb-command-injection",
+            replacements=(('system("echo " + cmd)', 'system("echo", cmd) # Safe arg passing'),)),
+    FixRule("rb-hardcoded-api-key",
+            replacements=(('API_KEY = "12345-abcde"', 'API_KEY = ENV["API_KEY"]'),)),
+]}
+
+def resolve_rule_id(language: str, finding: str) -> Optional[str]:
+    """Accepts a rule id or the finding message HackerAgent reports for it."""
+    if finding in FIX_RULES:
+        return finding
+    return RULE_IDS_BY_MESSAGE.get((language, finding))
+
+def plan_fixes(content: str, rule_ids: List[str]) -> List[Edit]:
+    """
+    Edits that remediate `rule_ids` in `content`, as spans of the original
+    text in ascending order. Every pattern is matched against the original
+    content and the edits are merged, so the file is rewritten in one pass.
+    Where matches overlap, the leftmost (then the earlier rule's) wins.
+    Prefixes of later rules go in front of earlier ones and suffixes after,
+    so the result nests exactly like applying the fixes one after another.
+    """
+    fixes = [FIX_RULES[r] for r in dict.fromkeys(rule_ids) if r in FIX_RULES]
+
+    replacements: List[Edit] = []
+    for fix in fixes:
+        for pattern, text in fix.replacements:
+            if isinstance(pattern, str):
+                # Literal: str.find is a C-speed scan and rejects absent patterns at once
+                pos = content.find(pattern)
+                while pos != -1:
+                    replacements.append(Edit(pos, pos + len(pattern), text))
+                    pos = content.find(pattern, pos + len(pattern))
+            else:
+                replacements.extend(Edit(m.start(), m.end(), text) for m in pattern.finditer(content))
+    # Matches come out grouped by pattern, so even a single rule's edits need ordering.
+    # Stable sort keeps rule order among edits starting at the same offset.
+    replacements.sort(key=lambda edit: edit.start)
+    merged, cursor = [], 0
+    for edit in replacements:
+        if edit.start >= cursor:
+            merged.append(edit)
+            cursor = edit.end
+    replacements = merged
+
+    prefix = "".join(
+        fix.prefix for fix in reversed(fixes)
+        if fix.prefix and not (fix.prefix_unless and fix.prefix_unless in content)
+    )
+    suffix = "".join(fix.suffix for fix in fixes)
+    edits = [Edit(0, 0, prefix)] if prefix else []
+    edits.extend(replacements)
+    if suffix:
+        edits.append(Edit(len(content), len(content), suffix))
+    return edits
+
+def apply_edits(content: str, edits: List[Edit]) -> str:
+    """Applies non-overlapping, ascending edits in one pass over the content."""
+    parts, cursor = [], 0
+    for edit in edits:
+        parts.append(content[cursor:edit.start])
+        parts.append(edit.text)
+        cursor = edit.end
+    parts.append(content[cursor:])
+    return "".join(parts)
@@ -0,0 +1,108 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+# Dashboard step shown for each pipeline phase
+PHASE_STEPS = {
+    "create": "Creating PR",
+    "hack": "Hacking...",
+    "fix": "Fixing...",
+    "validate": "Hacking...",
+    "report": "Orchestrating...",
+    "merge": "Merging",
+    "done": "Done",
+}
+
+@dataclass(frozen=True)
+class LogRecord:
+    seq: int # Position in the mission's log, counting evicted records
+    ts: float
+    agent: str
+    phase: str
+    message: str
+
+    def format(self) -> str:
+        return f"[{time.strftime('%H:%M:%S', time.localtime(self.ts))}] {self.message}"
+
+class LogSpill:
+    """
+    Append-only JSON Lines file shared by every mission log; keeps the full
+    history on disk. write() only queues the line: a writer thread appends
+    and flushes in batches, so logging from the event loop never blocks on
+    disk. close() writes out whatever is still queued.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lines: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._drain, name="log-spill", daemon=True)
+        self._writer.start()
+
+    def write(self, mission_id: Optional[int], record: LogRecord):
+        self._lines.put(json.dumps({"mission": mission_id, **asdict(record)}))
+
+    def _drain(self):
+        while True:
+            line = self._lines.get()
+            batch = []
+            # Take everything queued meanwhile so one flush covers a burst of records
+            while line is not None:
+                batch.append(line + "\n")
+                try:
+                    line = self._lines.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._file.write("".join(batch))
+                self._file.flush()
+            if line is None:
+                return
+
+    def close(self):
+        self._lines.put(None)
+        self._writer.join()
+        self._file.close()
+
+class MissionLog:
+    """
+    Ring buffer holding the last `capacity` log records of one mission.
+    Sequence numbers keep counting past evictions, so readers can resume
+    from an offset and simply miss what has already been dropped.
+    """
+    def __init__(self, capacity: int = 1000, spill: Optional[LogSpill] = None):
+        self.capacity = capacity
+        self.spill = spill
+        self.mission_id: Optional[int] = None
+        self._records: deque = deque(maxlen=capacity)
+        self.total = 0
+
+    def append(self, message: str, agent: str = "system", phase: str = "") -> LogRecord:
+        record = LogRecord(self.total, time.time(), agent, phase, message)
+        self._records.append(record)
+        self.total += 1
+        if self.spill is not None:
+            self.spill.write(self.mission_id, record)
+        return record
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest record still held."""
+        return self.total - len(self._records)
+
+    def since(self, seq: int = 0) -> List[LogRecord]:
+        start = max(seq - self.first_seq, 0)
+        return list(islice(self._records, start, None))
+
+    def lines(self, seq: int = 0) -> List[str]:
+        return [record.format() for record in self.since(seq)]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def to_dicts(self, seq: int = 0) -> List[Dict[str, Any]]:
+        return [asdict(record) for record in self.since(seq)]
@@ -0,0 +1,173 @@
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds in seconds, from sub-millisecond scans up to demo-paced missions
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+class Counter:
+    """Monotonic count per label set."""
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_labels(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in the Prometheus exposition layout."""
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(_labels(labels))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+# Process-wide metrics. Scans record into the process that runs them, so with
+# the process backend the scan and rule metrics stay in the worker processes.
+PHASE_SECONDS = Histogram("mission_phase_seconds", "Work time per mission phase, excluding pacing.")
+MISSION_SECONDS = Histogram("mission_run_seconds", "Time from a mission starting to finishing.")
+QUEUE_WAIT_SECONDS = Histogram("mission_queue_wait_seconds", "Time a mission waited in the scheduler queue.")
+SCAN_SECONDS = Histogram("scan_seconds", "Time to scan one file, per language.")
+SCAN_BYTES = Counter("scan_bytes_total", "Characters scanned, per language.")
+
+class RuleStats:
+    """
+    Per-rule evaluation time, evaluations and hits. Updated once per rule per
+    scanned file, so it keeps one flat dict under one lock instead of three
+    labelled counters.
+    """
+    def __init__(self):
+        self._rules: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, language: str, rule_id: str, seconds: float, hits: int):
+        """Observer passed to RuleSet.scan."""
+        with self._lock:
+            stats = self._rules.get((language, rule_id))
+            if stats is None:
+                stats = self._rules[(language, rule_id)] = [0.0, 0, 0]
+            stats[0] += seconds
+            stats[1] += 1
+            stats[2] += hits
+
+    def get(self, language: str, rule_id: str) -> Dict[str, float]:
+        seconds, evaluations, hits = self._rules.get((language, rule_id), (0.0, 0, 0))
+        return {"seconds": seconds, "evaluations": evaluations, "hits": hits}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            rows = sorted(self._rules.items())
+        lines = []
+        for i, (name, help) in enumerate([
+            ("rule_eval_seconds_total", "Time spent evaluating each rule, including its atom lookups."),
+            ("rule_evaluations_total", "Times each rule was evaluated."),
+            ("rule_hits_total", "Findings reported by each rule."),
+        ]):
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+            for (language, rule_id), stats in rows:
+                lines.append(f'{name}{{language="{language}",rule="{rule_id}"}} {stats[i]:g}')
+        return lines
+
+RULES = RuleStats()
+observe_rule = RULES.observe
+
+METRICS = [PHASE_SECONDS, MISSION_SECONDS, QUEUE_WAIT_SECONDS, SCAN_SECONDS, SCAN_BYTES, RULES]
+
+def observe_phases(timings: Dict[str, Dict[str, float]]):
+    """Records a mission's MissionClock report."""
+    for phase, t in timings.items():
+        PHASE_SECONDS.observe(t["work"], phase=phase)
+
+def render(gauges: Optional[Dict[str, float]] = None) -> str:
+    """Every metric in the Prometheus text exposition format, plus point-in-time gauges."""
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, value in (gauges or {}).items():
+        lines.extend([f"# TYPE {name} gauge", f"{name} {value:g}"])
+    return "\n".join(lines) + "\n"
+
+@contextmanager
+def profiled(top: int = 20) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Runs the block under cProfile and fills the yielded list with the `top`
+    functions by self time. cProfile only sees the current thread, so work
+    handed to backend threads or processes shows up as the time spent
+    waiting for it, and other coroutines sharing the loop are included.
+    """
+    # Imported on first use so that processes which never profile skip loading them
+    import cProfile
+    import pstats
+
+    hotspots: List[Dict[str, Any]] = []
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield hotspots
+    finally:
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in rows:
+            hotspots.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "self_s": round(self_time, 6),
+                "cumulative_s": round(cumulative, 6),
+            })
@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
+import difflib
+import threading
 import time
 
 @dataclass
@@ -7,6 +9,17 @@ class MockFile:
     filename: str
     content: str
     language: str
+    base_content: Optional[str] = None # Content at the PR's base revision; None for a new file
+    diff: Optional[str] = None # Unified diff base -> content, as a code host would supply it
+
+    def unified_diff(self) -> str:
+        """Returns the diff against the base revision, computing it (without context lines) if not supplied."""
+        if self.diff is None and self.base_content is not None:
+            self.diff = "\n".join(difflib.unified_diff(
+                self.base_content.split("\n"), self.content.split("\n"),
+                fromfile=f"a/{self.filename}", tofile=f"b/{self.filename}", n=0, lineterm="",
+            ))
+        return self.diff or ""
 
 @dataclass
 class MockPR:
@@ -16,36 +29,132 @@ class MockPR:
     status: str = "OPEN" # OPEN, MERGED, CLOSED
     comments: List[str] = field(default_factory=list)
     checks: Dict[str, str] = field(default_factory=dict) # check_name -> status (PENDING, PASS, FAIL)
+    _file_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False) # filename -> position
+    _indexed_files: Optional[List[MockFile]] = field(default=None, init=False, repr=False, compare=False)
+
+    def _indexed(self, filename: str) -> Optional[MockFile]:
+        i = self._file_index.get(filename)
+        if i is not None and i < len(self.files) and self.files[i].filename == filename:
+            return self.files[i]
+        return None
+
+    def get_file(self, filename: str) -> Optional[MockFile]:
+        """
+        O(1) lookup by filename. A hit is checked against the list itself, so
+        files added, removed or replaced directly (or a whole new list) only
+        cost a rebuild of the index on the next miss.
+        """
+        file = self._indexed(filename) if self._indexed_files is self.files else None
+        if file is None:
+            # reversed() so the first file wins on duplicate names, as with a linear search
+            self._file_index = {file.filename: i for i, file in reversed(list(enumerate(self.files)))}
+            self._indexed_files = self.files
+            file = self._indexed(filename)
+        return file
 
 class MockGitHub:
+    """
+    In-memory code host. Safe to share between concurrently running missions:
+    PR ids are allocated under a store-wide lock and every mutation of a PR
+    holds that PR's lock. The bulk methods apply a whole batch under one
+    acquisition so a mission can commit its results in a single call.
+    """
     def __init__(self):
         self.prs: Dict[int, MockPR] = {}
         self.next_pr_id = 1
+        self._lock = threading.Lock()
+        self._pr_locks: Dict[int, threading.Lock] = {}
 
     def create_pr(self, title: str, files: List[MockFile]) -> MockPR:
-        pr = MockPR(id=self.next_pr_id, title=title, files=files)
-        self.prs[self.next_pr_id] = pr
-        self.next_pr_id += 1
+        with self._lock:
+            pr = MockPR(id=self.next_pr_id, title=title, files=files)
+            self._pr_locks[pr.id] = threading.Lock()
+            self.prs[pr.id] = pr
+            self.next_pr_id += 1
         return pr
 
     def get_pr(self, pr_id: int) -> Optional[MockPR]:
         return self.prs.get(pr_id)
 
     def add_comment(self, pr_id: int, comment: str):
+        self.add_comments(pr_id, [comment])
+
+    def add_comments(self, pr_id: int, comments: List[str]):
         if pr_id in self.prs:
-            self.prs[pr_id].comments.append(comment)
+            with self._pr_locks[pr_id]:
+                self.prs[pr_id].comments.extend(comments)
+
+    def submit_review(self, pr_id: int, comments: List[str]):
+        """Posts several comments as one review: a single comment holding all of them."""
+        if comments:
+            self.add_comments(pr_id, ["\n\n".join(comments)])
 
     def update_check_status(self, pr_id: int, check_name: str, status: str):
+        self.set_checks(pr_id, {check_name: status})
+
+    def set_checks(self, pr_id: int, checks: Dict[str, str]):
         if pr_id in self.prs:
-            self.prs[pr_id].checks[check_name] = status
+            with self._pr_locks[pr_id]:
+                self.prs[pr_id].checks.update(checks)
 
     def merge_pr(self, pr_id: int):
         if pr_id in self.prs:
-            self.prs[pr_id].status = "MERGED"
+            with self._pr_locks[pr_id]:
+                self.prs[pr_id].status = "MERGED"
 
     def update_file_content(self, pr_id: int, filename: str, new_content: str):
-         if pr_id in self.prs:
-            for file in self.prs[pr_id].files:
-                if file.filename == filename:
-                    file.content = new_content
-                    return
+        self.update_files(pr_id, {filename: new_content})
+
+    def update_files(self, pr_id: int, contents: Dict[str, str]):
+        """Replaces the content of several files (filename -> content); unknown filenames are ignored."""
+        if pr_id in self.prs:
+            pr = self.prs[pr_id]
+            with self._pr_locks[pr_id]:
+                for filename, new_content in contents.items():
+                    file = pr.get_file(filename)
+                    if file is not None:
+                        file.content = new_content
+                        file.diff = None # Stale; recomputed from base_content on demand
+
+class SlowGitHub(MockGitHub):
+    """
+    MockGitHub whose writes behave like calls to a remote code host: each one
+    counts as a round-trip and sleeps for `latency` seconds first. With
+    fail_every=N, every Nth write raises ConnectionError before applying.
+    """
+    def __init__(self, latency: float = 0.0, fail_every: int = 0):
+        super().__init__()
+        self.latency = latency
+        self.fail_every = fail_every
+        self.round_trips = 0
+        self._calls_lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._calls_lock:
+            self.round_trips += 1
+            failing = self.fail_every and self.round_trips % self.fail_every == 0
+        if self.latency:
+            time.sleep(self.latency)
+        if failing:
+            raise ConnectionError("code host unavailable")
+
+    def add_comments(self, pr_id: int, comments: List[str]):
+        self._round_trip()
+        super().add_comments(pr_id, comments)
+
+    def submit_review(self, pr_id: int, comments: List[str]):
+        if comments:
+            self._round_trip()
+            MockGitHub.add_comments(self, pr_id, ["\n\n".join(comments)])
+
+    def set_checks(self, pr_id: int, checks: Dict[str, str]):
+        self._round_trip()
+        super().set_checks(pr_id, checks)
+
+    def update_files(self, pr_id: int, contents: Dict[str, str]):
+        self._round_trip()
+        super().update_files(pr_id, contents)
+
+    def merge_pr(self, pr_id: int):
+        self._round_trip()
+        super().merge_pr(pr_id)
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Set
+
+from mock_github import MockGitHub
+
+class OutboxFlushError(Exception):
+    """Raised by Outbox.flush when a write still fails after every retry; the write stays queued."""
+
+@dataclass
+class PendingWrites:
+    files: Dict[str, str] = field(default_factory=dict)   # filename -> latest content
+    comments: List[str] = field(default_factory=list)     # posted together as one review
+    checks: Dict[str, str] = field(default_factory=dict)  # check name -> latest status
+
+class Outbox:
+    """
+    Buffers a mission's writes to the code host and sends them in as few
+    round-trips as possible: file updates in one call, all comments as one
+    review, and only the final status of each check (skipping statuses the
+    host already shows). Offers the same write methods as MockGitHub, so it
+    can stand in for it; reads still go to the host. flush() runs the calls
+    off the event loop and retries failed ones with exponential backoff;
+    writes that still fail are retried later by run().
+    """
+    def __init__(self, host: MockGitHub, max_retries: int = 3, backoff: float = 0.05):
+        self.host = host
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._pending: Dict[int, PendingWrites] = {}
+        self._sent_checks: Dict[int, Dict[str, str]] = {}
+        self._finished: Set[int] = set() # PRs to forget once their writes are delivered
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self.retries = 0
+
+    def _writes(self, pr_id: int) -> PendingWrites:
+        return self._pending.setdefault(pr_id, PendingWrites())
+
+    def add_comment(self, pr_id: int, comment: str):
+        self.add_comments(pr_id, [comment])
+
+    def add_comments(self, pr_id: int, comments: List[str]):
+        with self._lock:
+            self._writes(pr_id).comments.extend(comments)
+
+    def update_check_status(self, pr_id: int, check_name: str, status: str):
+        self.set_checks(pr_id, {check_name: status})
+
+    def set_checks(self, pr_id: int, checks: Dict[str, str]):
+        with self._lock:
+            self._writes(pr_id).checks.update(checks)
+
+    def update_file_content(self, pr_id: int, filename: str, new_content: str):
+        self.update_files(pr_id, {filename: new_content})
+
+    def update_files(self, pr_id: int, contents: Dict[str, str]):
+        with self._lock:
+            self._writes(pr_id).files.update(contents)
+
+    def pending(self, pr_id: int) -> bool:
+        writes = self._pending.get(pr_id)
+        return bool(writes and (writes.files or writes.comments or writes.checks))
+
+    async def _send(self, call: Callable, *args):
+        for attempt in range(self.max_retries + 1):
+            self.round_trips += 1
+            try:
+                return await asyncio.to_thread(call, *args)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise OutboxFlushError(f"{call.__name__} failed after {attempt + 1} attempts: {e}") from e
+                self.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def flush(self, pr_id: int):
+        """
+        Sends everything queued for the PR: files, then the review, then the
+        checks, so statuses land after the code they describe. A write that
+        keeps failing is put back (unless newer data replaced it) and raised.
+        """
+        with self._lock:
+            writes = self._pending.pop(pr_id, None)
+        if writes is None:
+            return
+        sent = self._sent_checks.setdefault(pr_id, {})
+        checks = {name: status for name, status in writes.checks.items() if sent.get(name) != status}
+        try:
+            if writes.files:
+                await self._send(self.host.update_files, pr_id, writes.files)
+                writes.files = {}
+            if writes.comments:
+                await self._send(self.host.submit_review, pr_id, writes.comments)
+                writes.comments = []
+            if checks:
+                await self._send(self.host.set_checks, pr_id, checks)
+                sent.update(checks)
+                writes.checks = {}
+        except OutboxFlushError:
+            with self._lock:
+                newer = self._pending.get(pr_id, PendingWrites())
+                self._pending[pr_id] = PendingWrites(
+                    files={**writes.files, **newer.files},
+                    comments=writes.comments + newer.comments,
+                    checks={**writes.checks, **newer.checks},
+                )
+            raise
+
+    def finish(self, pr_id: int):
+        """
+        Marks the PR's mission as over. Its state is dropped now if everything
+        was delivered, otherwise once retry_pending() gets the writes through.
+        """
+        with self._lock:
+            if self.pending(pr_id):
+                self._finished.add(pr_id)
+                return
+            self._pending.pop(pr_id, None)
+            self._sent_checks.pop(pr_id, None)
+
+    async def retry_pending(self):
+        """
+        Flushes the finished PRs whose writes were not delivered; those failing
+        again stay queued. PRs whose mission is still running are left alone,
+        so their writes keep coalescing until the mission's own flush.
+        """
+        with self._lock:
+            pr_ids = [pr_id for pr_id in self._finished if self.pending(pr_id)]
+        for pr_id in pr_ids:
+            try:
+                await self.flush(pr_id)
+            except OutboxFlushError:
+                continue
+            with self._lock:
+                if pr_id in self._finished and not self.pending(pr_id):
+                    self._finished.discard(pr_id)
+                    self._sent_checks.pop(pr_id, None)
+
+    async def run(self, interval: float = 5.0):
+        """Background loop retrying undelivered writes every `interval` seconds; cancel to stop."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.retry_pending()
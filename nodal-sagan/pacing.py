@@ -0,0 +1,60 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Seconds of artificial delay per pipeline step
+PACING_MODES = {
+    "demo": 1.0,        # Keeps the dashboard animation watchable
+    "throughput": 0.0,  # No artificial latency
+}
+
+class Pacing:
+    """How long the pipeline pauses between steps."""
+    def __init__(self, mode: str = "demo"):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode '{mode}' (expected one of {', '.join(PACING_MODES)})")
+        self.mode = mode
+        self.delay = PACING_MODES[mode]
+
+    async def pause(self) -> float:
+        """Sleeps for one step and returns the seconds slept."""
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+        return self.delay
+
+class MissionClock:
+    """
+    Records wall time per mission phase, separating artificial pacing from
+    real work so the mission result shows where time actually goes.
+    """
+    def __init__(self, pacing: Pacing):
+        self.pacing = pacing
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._current: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        self.phases.setdefault(name, {"wall": 0.0, "paced": 0.0})
+        previous, self._current = self._current, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name]["wall"] += time.perf_counter() - start
+            self._current = previous
+
+    async def pause(self):
+        slept = await self.pacing.pause()
+        if self._current is not None:
+            self.phases[self._current]["paced"] += slept
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "wall": round(t["wall"], 6),
+                "paced": round(t["paced"], 6),
+                "work": round(t["wall"] - t["paced"], 6),
+            }
+            for name, t in self.phases.items()
+        }
@@ -0,0 +1,52 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+
+from logstore import MissionLog
+
+def content_hash(text: str) -> str:
+    """Short content hash; doubles as the ETag of the body it was computed from."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=12).hexdigest()
+
+def describe_files(files: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    return {name: {"hash": content_hash(content), "size": len(content)} for name, content in files.items()}
+
+def describe_tests(tests: List[str]) -> Dict[str, Any]:
+    return {"count": len(tests), "hash": content_hash("\0".join(tests))}
+
+def empty_digests() -> Dict[str, Any]:
+    """
+    Digests of a mission state's bodies, kept in state["digests"] under the
+    same keys as the bodies. They are computed once, whenever the bodies are
+    stored, so polls and ETag checks never rehash file contents.
+    """
+    return {"files": {}, "fixed_code": {}, "generated_tests": describe_tests([])}
+
+def summarize_state(state: dict, since: Optional[int] = None) -> dict:
+    """
+    Poll-sized view of a mission state: file bodies and tests are replaced by
+    hashes and sizes, to be fetched from their own endpoints when they change.
+    """
+    logs: MissionLog = state["logs"]
+    digests = state["digests"]
+    view = {
+        **{key: value for key, value in state.items() if key != "digests"},
+        "logs": logs.lines(since or 0),
+        "pr_details": {**state["pr_details"], "files": digests["files"]},
+        "fixed_code": digests["fixed_code"],
+        "generated_tests": digests["generated_tests"],
+    }
+    if since is not None:
+        view["log_offset"] = max(since, logs.first_seq)
+        view["log_total"] = logs.total
+    return view
+
+def etag_response(body: Any, etag: str, if_none_match: Optional[str], media_type: str) -> Response:
+    """Returns 304 when the client already holds this ETag, else the body tagged with it."""
+    tag = f'"{etag}"'
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    held = [t.strip().removeprefix("W/") for t in (if_none_match or "").split(",")]
+    if tag in held or "*" in held:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
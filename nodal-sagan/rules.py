@@ -0,0 +1,256 @@
+import hashlib
+import io
+import re
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, List, Optional, Pattern, TextIO, Tuple, Union
+
+# An atom is either a plain substring or a compiled regex.
+Atom = Union[str, Pattern]
+
+# Called per rule evaluated: (language, rule id, seconds, hits)
+RuleObserver = Callable[[str, str, float, int], None]
+
+# Streaming scans read this many characters at a time...
+CHUNK_SIZE = 1 << 20
+# ...and guarantee to find matches up to this long across chunk boundaries.
+MAX_MATCH = 4096
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A single detection rule. The rule fires when every `requires` atom occurs
+    in the content and no `forbids` atom does. The first required atom is the
+    anchor: each of its occurrences is reported as a hit.
+    """
+    id: str
+    language: str
+    message: str
+    requires: Tuple[Atom, ...]
+    forbids: Tuple[Atom, ...] = ()
+
+@dataclass(frozen=True)
+class Finding:
+    rule_id: str
+    language: str
+    message: str
+    offset: int
+    line: int
+    column: int
+
+RULES: Dict[str, List[Rule]] = {
+    "python": [
+        Rule("py-hardcoded-password", "python", "Exploit Successful: Extracted Admin Password",
+             requires=(re.compile(r'password\s*=\s*"'),), forbids=("os.getenv",)),
+        Rule("py-eval-rce", "python", "Exploit Successful: Remote Code Execution via eval()",
+             requires=("eval(",), forbids=("ast.literal_eval",)),
+        Rule("py-sqli-fstring", "python", "Exploit Successful: SQL Injection via f-string",
+             requires=("SELECT * FROM", 'f"'), forbids=("?",)),
+    ],
+    "javascript": [
+        Rule("js-xss-innerhtml", "javascript", "Exploit Successful: Stored XSS Payload in DOM",
+             requires=("innerHTML =",)),
+        Rule("js-hardcoded-password", "javascript", "Exploit Successful: Leaked DB Password",
+             requires=("password:",), forbids=("process.env",)),
+        Rule("js-path-traversal", "javascript", "Exploit Successful: Path Traversal /etc/passwd",
+             requires=("res.sendFile",), forbids=("path.basename",)),
+    ],
+    "abap": [
+        Rule("abap-dynamic-sql", "abap", "Exploit Successful: Dropped Table via Dynamic SQL",
+             requires=("EXEC SQL",)),
+        Rule("abap-missing-authority-check", "abap", "Exploit Successful: Unauthorized Data Access",
+             requires=("SELECT * FROM",), forbids=("AUTHORITY-CHECK",)),
+    ],
+    "java": [
+        Rule("java-sqli-concat", "java", "Exploit Successful: SQL Injection via String Concatenation",
+             requires=("SELECT * FROM", "+"), forbids=("?",)),
+        Rule("java-log-injection", "java", "Exploit Successful: Forged Log Entries",
+             requires=("logger.info",), forbids=("ESAPI",)),
+    ],
+    "go": [
+        Rule("go-sqli-sprintf", "go", "Exploit Successful: SQL Injection via Sprintf",
+             requires=("SELECT * FROM", "fmt.Sprintf")),
+        Rule("go-command-injection", "go", "Exploit Successful: Root Shell obtained",
+             requires=("exec.Command", "sh"), forbids=("isValid",)),
+    ],
+    "ruby": [
+        Rule("rb-command-injection", "ruby", "Exploit Successful: Server Hijacked via Command Injection",
+             requires=("system(",), forbids=("Safe arg",)),
+        Rule("rb-hardcoded-api-key", "ruby", "Exploit Successful: Stolen API Key",
+             requires=("API_KEY =",), forbids=("ENV[",)),
+    ],
+}
+
+class RuleSet:
+    """
+    All rules of one language, compiled once. Atoms shared between rules are
+    deduplicated and looked up lazily, so each distinct atom is searched at
+    most once per scan and rules short-circuit like the original ladder.
+    Plain substrings use str.find (C fast search); only real patterns go
+    through the regex engine.
+    """
+    def __init__(self, language: str, rules: List[Rule]):
+        self.language = language
+        self.rules = rules
+        atoms: List[Atom] = []
+        for rule in rules:
+            for atom in rule.requires + rule.forbids:
+                if atom not in atoms:
+                    atoms.append(atom)
+        self.atoms = atoms
+
+    def _first(self, atom: Atom, content: str, start: int = 0) -> int:
+        if isinstance(atom, str):
+            return content.find(atom, start)
+        m = atom.search(content, start)
+        return m.start() if m else -1
+
+    def scan(self, content: str, observe: Optional[RuleObserver] = None) -> List[Finding]:
+        """
+        `observe`, if given, is called after each rule with (language, rule id,
+        seconds, hits). A rule's time includes the lookups of atoms it was
+        first to need, so shared atoms are charged to the earliest rule.
+        """
+        # First occurrence of each atom, computed lazily and shared between rules.
+        first: Dict[Atom, int] = {}
+
+        def present(atom: Atom) -> bool:
+            if atom not in first:
+                first[atom] = self._first(atom, content)
+            return first[atom] != -1
+
+        hits: List[Tuple[Rule, int]] = []
+        for rule in self.rules:
+            if observe is not None:
+                start, before = time.perf_counter(), len(hits)
+            if all(present(a) for a in rule.requires) and not any(present(a) for a in rule.forbids):
+                anchor = rule.requires[0]
+                pos = first[anchor]
+                while pos != -1:
+                    hits.append((rule, pos))
+                    pos = self._first(anchor, content, pos + 1)
+            if observe is not None:
+                observe(self.language, rule.id, time.perf_counter() - start, len(hits) - before)
+        return _locate(hits, content, self.language)
+
+    def scan_stream(self, stream: TextIO, chunk_size: int = CHUNK_SIZE, overlap: int = MAX_MATCH) -> List[Finding]:
+        """
+        Same findings as scan(), reading the content in chunks so memory stays
+        bounded by chunk_size + overlap. Each window keeps the last `overlap`
+        characters of the previous one, so any match up to that length that
+        straddles a chunk boundary is still found exactly once.
+        """
+        anchors = {rule.requires[0] for rule in self.rules}
+        seen = set()
+        anchor_hits: Dict[Atom, List[Tuple[int, int, int]]] = {atom: [] for atom in anchors}
+
+        carry, carry_start = "", 0  # unscanned tail and its absolute offset
+        line, line_start = 1, 0     # line number at carry_start and absolute offset of that line
+        eof = False
+        while not eof:
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            window = carry + chunk
+            # Only match starts below `limit` are final; the rest is rescanned with the next chunk
+            limit = len(window) if eof else max(len(window) - overlap, 0)
+
+            positions: Dict[int, List[Atom]] = {}
+            for atom in self.atoms:
+                if atom in anchors:
+                    pos = self._first(atom, window)
+                    while pos != -1 and pos < limit:
+                        positions.setdefault(pos, []).append(atom)
+                        pos = self._first(atom, window, pos + 1)
+                elif atom not in seen:
+                    pos = self._first(atom, window)
+                    if pos != -1 and pos < limit:
+                        seen.add(atom)
+
+            located = _line_columns(window, sorted(positions), line, line_start - carry_start)
+            for pos, atoms in positions.items():
+                for atom in atoms:
+                    seen.add(atom)
+                    anchor_hits[atom].append((carry_start + pos, *located[pos]))
+
+            consumed = window[:limit]
+            line += consumed.count("\n")
+            nl = consumed.rfind("\n")
+            if nl != -1:
+                line_start = carry_start + nl + 1
+            carry, carry_start = window[limit:], carry_start + limit
+
+        findings: List[Finding] = []
+        for rule in self.rules:
+            if all(a in seen for a in rule.requires) and not any(a in seen for a in rule.forbids):
+                hits = sorted(anchor_hits[rule.requires[0]])
+                findings.extend(Finding(rule.id, self.language, rule.message, *hit) for hit in hits)
+        return findings
+
+def _line_columns(text: str, positions: List[int], line: int = 1, line_start: int = 0) -> Dict[int, Tuple[int, int]]:
+    """
+    Maps sorted offsets in `text` to 1-based (line, column), walking the text
+    once. `line` is the line number at text[0] and `line_start` the offset
+    (relative to text, possibly negative) where that line begins.
+    """
+    located: Dict[int, Tuple[int, int]] = {}
+    cursor = 0
+    for pos in positions:
+        line += text.count("\n", cursor, pos)
+        nl = text.rfind("\n", cursor, pos)
+        if nl != -1:
+            line_start = nl + 1
+        cursor = pos
+        located[pos] = (line, pos - line_start + 1)
+    return located
+
+def _locate(hits: List[Tuple[Rule, int]], content: str, language: str) -> List[Finding]:
+    """Attach 1-based line/column numbers to in-memory hits."""
+    located = _line_columns(content, sorted({pos for _, pos in hits}))
+    return [
+        Finding(rule.id, language, rule.message, pos, *located[pos])
+        for rule, pos in hits
+    ]
+
+def ruleset_version(rules: Dict[str, List[Rule]]) -> str:
+    """Fingerprint of the rule table; any change to a rule yields a new version."""
+    def atom_key(atom: Atom) -> str:
+        return atom if isinstance(atom, str) else f"re:{atom.pattern}:{atom.flags}"
+
+    digest = hashlib.sha256()
+    for language in sorted(rules):
+        for rule in rules[language]:
+            parts = [rule.id, rule.language, rule.message]
+            parts += ["+" + atom_key(a) for a in rule.requires] + ["-" + atom_key(a) for a in rule.forbids]
+            digest.update("\x1f".join(parts).encode() + b"\x1e")
+    return digest.hexdigest()[:16]
+
+RULESET_VERSION = ruleset_version(RULES)
+
+# (language, message) -> rule id, for callers that only kept the human-readable message
+RULE_IDS_BY_MESSAGE: Dict[Tuple[str, str], str] = {
+    (rule.language, rule.message): rule.id for rules in RULES.values() for rule in rules
+}
+
+COMPILED_RULES: Dict[str, RuleSet] = {lang: RuleSet(lang, rules) for lang, rules in RULES.items()}
+
+def scan_content(content: str, language: str, observe: Optional[RuleObserver] = None) -> List[Finding]:
+    """Returns every rule hit in `content`, ordered by rule then by offset."""
+    ruleset = COMPILED_RULES.get(language)
+    if ruleset is None:
+        return []
+    return ruleset.scan(content, observe)
+
+def scan_stream(stream: Union[TextIO, BinaryIO], language: str, chunk_size: int = CHUNK_SIZE) -> List[Finding]:
+    """Like scan_content, but reads a text or UTF-8 byte stream in bounded-size chunks."""
+    ruleset = COMPILED_RULES.get(language)
+    if ruleset is None:
+        return []
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding="utf-8", errors="replace", newline="")
+    return ruleset.scan_stream(stream, chunk_size=chunk_size)
+
+def scan_path(path: str, language: str, chunk_size: int = CHUNK_SIZE) -> List[Finding]:
+    """Scans a file on disk without loading it into memory."""
+    # newline="" keeps offsets identical to the in-memory content
+    with open(path, encoding="utf-8", errors="replace", newline="") as stream:
+        return scan_stream(stream, language, chunk_size=chunk_size)
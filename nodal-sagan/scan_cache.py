@@ -0,0 +1,71 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import rules
+from mock_github import MockFile
+
+CacheKey = Tuple[str, str, str]
+
+class ScanCache:
+    """
+    Bounded LRU cache of HackerAgent results, keyed by
+    (language, content hash, rule-set version). Changing any rule changes
+    RULESET_VERSION, so stale entries simply stop matching and age out.
+    Safe to share between missions and threads.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(file: MockFile, diff_context: Optional[int] = None) -> CacheKey:
+        h = hashlib.blake2b(file.content.encode("utf-8", "surrogatepass"), digest_size=16)
+        if diff_context is not None and file.base_content is not None:
+            # Diff-aware results also depend on the base revision and the context window
+            h.update(f"\0{diff_context}\0".encode())
+            h.update(file.base_content.encode("utf-8", "surrogatepass"))
+        return (file.language, h.hexdigest(), rules.RULESET_VERSION)
+
+    @classmethod
+    def keys(cls, files: List[MockFile], diff_context: Optional[int] = None) -> List[CacheKey]:
+        return [cls.key(file, diff_context) for file in files]
+
+    def get(self, key: CacheKey) -> Optional[List[str]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(result)
+
+    def put(self, key: CacheKey, vulnerabilities: List[str]):
+        with self._lock:
+            self._entries[key] = tuple(vulnerabilities)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ruleset_version": rules.RULESET_VERSION,
+        }
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import metrics
+
+class QueueFullError(Exception):
+    """Raised by MissionScheduler.submit when the pending queue is at capacity."""
+
+@dataclass
+class Mission:
+    id: int
+    state: Dict[str, Any]
+    run: Callable[[], Awaitable[None]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def timing(self) -> Dict[str, Optional[float]]:
+        now = time.monotonic()
+        queue_wait = (self.started_at or now) - self.enqueued_at
+        run_time = None
+        if self.started_at is not None:
+            run_time = (self.finished_at or now) - self.started_at
+        return {"queue_wait": round(queue_wait, 4), "run_time": run_time and round(run_time, 4)}
+
+class MissionScheduler:
+    """
+    Runs missions concurrently on a bounded pool of asyncio workers.
+    Submissions wait in a bounded FIFO queue; once it is full, submit raises
+    QueueFullError so callers can push back instead of silently dropping work.
+    Only the `max_finished` most recently finished missions are kept for
+    lookup; older ones are evicted along with their state. Callers that
+    have work to do before submitting can reserve() a slot first.
+    """
+    def __init__(self, max_workers: int = 4, max_queue: int = 100, max_finished: int = 1000):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self.missions: Dict[int, Mission] = {}
+        self._finished: "OrderedDict[int, None]" = OrderedDict() # finished mission ids, oldest first
+        self._queue: Optional[asyncio.Queue] = None
+        self._reserved = 0 # slots promised to reserve() callers but not yet submitted
+        self._workers: List[asyncio.Task] = []
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _ensure_workers(self):
+        # Workers are started lazily so the scheduler can be built outside an event loop.
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    def check_capacity(self):
+        """Raises QueueFullError (and counts a rejection) if a submit would not fit."""
+        self._ensure_workers()
+        if self._queue.qsize() + self._reserved >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(f"Mission queue is full ({self.max_queue} pending)")
+
+    def reserve(self):
+        """
+        Holds a queue slot for a later submit(..., reserved=True), so nothing
+        submitted in between can take it. Raises QueueFullError if none is
+        free; call release() if the mission is not submitted after all.
+        """
+        self.check_capacity()
+        self._reserved += 1
+
+    def release(self):
+        self._reserved -= 1
+
+    def submit(self, mission_id: int, state: Dict[str, Any], run: Callable[[], Awaitable[None]],
+               reserved: bool = False) -> Mission:
+        if reserved:
+            self.release()
+        else:
+            self.check_capacity()
+
+        mission = Mission(id=mission_id, state=state, run=run)
+        self.missions[mission_id] = mission
+        self._queue.put_nowait(mission)
+        self.submitted += 1
+        return mission
+
+    def get(self, mission_id: int) -> Optional[Mission]:
+        return self.missions.get(mission_id)
+
+    def _retire(self, mission_id: int):
+        self._finished[mission_id] = None
+        while len(self._finished) > self.max_finished:
+            evicted, _ = self._finished.popitem(last=False)
+            self.missions.pop(evicted, None)
+
+    async def _worker(self):
+        while True:
+            mission = await self._queue.get()
+            mission.started_at = time.monotonic()
+            metrics.QUEUE_WAIT_SECONDS.observe(mission.started_at - mission.enqueued_at)
+            self.running += 1
+            try:
+                await mission.run()
+                self.completed += 1
+            except Exception:
+                self.failed += 1
+            finally:
+                self.running -= 1
+                mission.finished_at = time.monotonic()
+                metrics.MISSION_SECONDS.observe(mission.finished_at - mission.started_at)
+                self._retire(mission.id)
+                self._queue.task_done()
+
+    async def join(self):
+        """Waits until every queued mission has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def metrics(self) -> Dict[str, Any]:
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return {
+            "queue_depth": depth,
+            "max_queue": self.max_queue,
+            "queue_utilization": round(depth / self.max_queue, 4) if self.max_queue else 0.0,
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
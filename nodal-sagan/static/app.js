@@ -1,4 +1,8 @@
-let pollInterval;
+let eventSource;
+let logLines = [];
+let missionId = null;
+// Bodies fetched from the file/test endpoints, keyed by path and content hash
+const bodyCache = {};
 
 // Tab Switching Logic
 document.querySelectorAll('.tab-btn').forEach(button => {
@@ -35,7 +39,9 @@ async function startSimulation() {
         });
 
         if (response.ok) {
-            pollInterval = setInterval(fetchStatus, 1000);
+            const { mission_id } = await response.json();
+            logLines = [];
+            streamMission(mission_id);
 
             // Switch to Checks tab automatically to show progress
             document.querySelector('[data-tab="checks"]').click();
@@ -49,15 +55,38 @@ async function startSimulation() {
     }
 }
 
+// Log lines and state transitions are pushed over Server-Sent Events;
+// full state is only fetched at the start and once the mission ends.
+function streamMission(id) {
+    missionId = id;
+    if (eventSource) eventSource.close();
+    eventSource = new EventSource(`/api/missions/${missionId}/events`);
+
+    eventSource.addEventListener("log", (e) => {
+        logLines[Number(e.lastEventId) - 1] = JSON.parse(e.data);
+        renderLogs();
+    });
+    eventSource.addEventListener("state", (e) => {
+        updateGraph(JSON.parse(e.data).current_step);
+    });
+    eventSource.addEventListener("end", () => {
+        eventSource.close();
+        fetchStatus();
+    });
+
+    fetchStatus();
+}
+
 async function fetchStatus() {
     try {
-        const response = await fetch("/api/status");
+        // Only ask for log lines we don't have yet
+        const response = await fetch(`/api/missions/${missionId}?since=${logLines.length}`);
         const data = await response.json();
 
+        data.logs.forEach((log, i) => { logLines[data.log_offset + i] = log; });
         updateUI(data);
 
         if (data.status === "COMPLETED" || data.status === "ERROR") {
-            clearInterval(pollInterval);
             document.getElementById("startBtn").disabled = false;
             document.getElementById("startBtn").innerText = "Start Simulation";
         }
@@ -66,6 +95,14 @@ async function fetchStatus() {
     }
 }
 
+function renderLogs() {
+    const logsContainer = document.getElementById("logs");
+    if (logLines.length > 0) {
+        logsContainer.innerHTML = logLines.map(log => `<div>${log}</div>`).join("");
+        logsContainer.scrollTop = logsContainer.scrollHeight;
+    }
+}
+
 function updateUI(data) {
     if (!data) return;
 
@@ -75,11 +112,7 @@ function updateUI(data) {
     }
 
     // Update Checks Console
-    const logsContainer = document.getElementById("logs");
-    if (data.logs && data.logs.length > 0) {
-        logsContainer.innerHTML = data.logs.map(log => `<div>${log}</div>`).join("");
-        logsContainer.scrollTop = logsContainer.scrollHeight;
-    }
+    renderLogs();
 
     // Update Status Badge
     const stateBadge = document.getElementById("prState");
@@ -88,7 +121,7 @@ function updateUI(data) {
     updateGraph(data.current_step);
 
     if (data.status === "COMPLETED") {
-        if (data.pr_details && data.logs.some(l => l.includes("merged"))) {
+        if (data.pr_details && logLines.some(l => l.includes("merged"))) {
             stateBadge.innerText = "Merged";
             stateBadge.className = "state state-merged";
         } else {
@@ -146,16 +179,22 @@ function renderFileList(data) {
         else li.classList.remove("active");
     });
 
-    // Update content for selected file
+    // Update content for selected file; bodies are fetched only when their hash changes
     if (selectedFile) {
-        document.getElementById("filenameDisplay").innerText = selectedFile;
+        const filename = selectedFile;
+        document.getElementById("filenameDisplay").innerText = filename;
         // Original Content
-        document.getElementById("vulnerableCode").innerText = data.pr_details.files[selectedFile] || "";
+        loadBody(`files/${encodeURIComponent(filename)}?version=original`, data.pr_details.files[filename]).then(text => {
+            if (text !== null && selectedFile === filename) document.getElementById("vulnerableCode").innerText = text;
+        });
 
         // Fixed Content
-        if (data.fixed_code && data.fixed_code[selectedFile]) {
-            document.getElementById("secureCode").innerText = data.fixed_code[selectedFile];
-        } else if (data.status === "COMPLETED" && (!data.fixed_code || !data.fixed_code[selectedFile])) {
+        const fixed = data.fixed_code && data.fixed_code[filename];
+        if (fixed) {
+            loadBody(`files/${encodeURIComponent(filename)}?version=fixed`, fixed).then(text => {
+                if (text !== null && selectedFile === filename) document.getElementById("secureCode").innerText = text;
+            });
+        } else if (data.status === "COMPLETED") {
             document.getElementById("secureCode").innerText = "(No changes required)";
         } else {
             document.getElementById("secureCode").innerText = "(Pending fix...)";
@@ -163,9 +202,24 @@ function renderFileList(data) {
     }
 
     // Show tests (global for now)
-    if (data.generated_tests && data.generated_tests.length > 0) {
-        document.getElementById("testCode").innerText = data.generated_tests.join("\n\n");
+    if (data.generated_tests && data.generated_tests.count > 0) {
+        loadBody("tests", data.generated_tests).then(text => {
+            if (text !== null) document.getElementById("testCode").innerText = JSON.parse(text).join("\n\n");
+        });
+    }
+}
+
+async function loadBody(path, meta) {
+    if (!meta) return null;
+    const key = `${path}@${meta.hash}`;
+    if (!(key in bodyCache)) {
+        // The endpoints send ETags, so the browser revalidates instead of re-downloading
+        const response = await fetch(`/api/missions/${missionId}/${path}`);
+        // Don't cache error bodies under the hash; the next poll retries
+        if (!response.ok) return null;
+        bodyCache[key] = await response.text();
     }
+    return bodyCache[key];
 }
 
 function selectFile(filename) {
@@ -220,12 +274,12 @@ function renderTimeline(data) {
     }
 
     // Test Generation
-    if (data.generated_tests && data.generated_tests.length > 0) {
+    if (data.generated_tests && data.generated_tests.count > 0) {
         html += createTimelineItem("fixer-agent", "Added security unit tests to verify fixes.");
     }
 
     // Supervisor Merge
-    if (data.status === "COMPLETED" && data.logs.some(l => l.includes("merged"))) {
+    if (data.status === "COMPLETED" && logLines.some(l => l.includes("merged"))) {
         html += createTimelineItem("supervisor-agent", "Constraints satisfied. Merging PR.");
     }
 
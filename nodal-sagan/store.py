@@ -0,0 +1,205 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from mock_github import MockPR
+from rules import RULE_IDS_BY_MESSAGE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS missions (
+    id INTEGER PRIMARY KEY,            -- the PR id
+    title TEXT NOT NULL,
+    language TEXT NOT NULL,
+    status TEXT NOT NULL,              -- mission status: COMPLETED, ERROR
+    pr_status TEXT NOT NULL,           -- OPEN, MERGED, CLOSED
+    n_files INTEGER NOT NULL,
+    n_findings INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    timings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS missions_language ON missions (language, id);
+CREATE INDEX IF NOT EXISTS missions_status ON missions (status, id);
+CREATE TABLE IF NOT EXISTS files (
+    mission_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    original TEXT NOT NULL,
+    fixed TEXT,                        -- NULL when the fixer left the file alone
+    PRIMARY KEY (mission_id, filename)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS findings (
+    mission_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    rule_id TEXT,                      -- NULL if the message no longer maps to a rule
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule_id, mission_id);
+CREATE INDEX IF NOT EXISTS findings_mission ON findings (mission_id);
+CREATE TABLE IF NOT EXISTS checks (
+    mission_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (mission_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS comments (
+    mission_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (mission_id, seq)
+) WITHOUT ROWID;
+"""
+
+@dataclass
+class MissionRecord:
+    """Everything kept about one finished mission; written in a single transaction."""
+    id: int
+    title: str
+    language: str
+    status: str
+    pr_status: str
+    files: Dict[str, str]                                            # filename -> original content
+    fixed: Dict[str, str] = field(default_factory=dict)              # filename -> fixed content
+    findings: Dict[str, List[str]] = field(default_factory=dict)     # filename -> messages
+    checks: Dict[str, str] = field(default_factory=dict)
+    comments: List[str] = field(default_factory=list)
+    timings: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    finished_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_mission(cls, pr: MockPR, language: str, status: str, originals: Dict[str, str],
+                     result: Optional[dict], created_at: float) -> "MissionRecord":
+        result = result or {}
+        return cls(
+            id=pr.id, title=pr.title, language=language, status=status, pr_status=pr.status,
+            files=dict(originals),
+            fixed={fix["filename"]: fix["content"] for fix in result.get("fixes", [])},
+            findings=dict(result.get("findings", {})),
+            checks=dict(pr.checks), comments=list(pr.comments),
+            timings=result.get("timings", {}), created_at=created_at,
+        )
+
+class MissionStore:
+    """
+    Append-only SQLite history of finished missions. Each mission is written
+    once, in one transaction, when it ends; nothing is loaded at startup, so
+    opening the store costs the same with 100 or 100k missions. Listing uses
+    keyset pagination over indexed columns. Safe to share between threads.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def last_mission_id(self) -> int:
+        """Highest stored mission id (0 if empty), so PR numbering can resume after a restart."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM missions").fetchone()[0]
+
+    def record_mission(self, record: MissionRecord):
+        self.record_missions([record])
+
+    def record_missions(self, records: List[MissionRecord]):
+        """Writes the missions and all their rows in one transaction."""
+        missions, files, findings, checks, comments = [], [], [], [], []
+        for r in records:
+            missions.append((
+                r.id, r.title, r.language, r.status, r.pr_status, len(r.files),
+                sum(len(messages) for messages in r.findings.values()),
+                r.created_at, r.finished_at, json.dumps(r.timings),
+            ))
+            files.extend((r.id, name, content, r.fixed.get(name)) for name, content in r.files.items())
+            findings.extend(
+                (r.id, name, RULE_IDS_BY_MESSAGE.get((r.language, message)), message)
+                for name, messages in r.findings.items() for message in messages
+            )
+            checks.extend((r.id, name, status) for name, status in r.checks.items())
+            comments.extend((r.id, seq, body) for seq, body in enumerate(r.comments))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT INTO missions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", missions)
+                self._conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?)", files)
+                self._conn.executemany("INSERT INTO findings VALUES (?, ?, ?, ?)", findings)
+                self._conn.executemany("INSERT INTO checks VALUES (?, ?, ?)", checks)
+                self._conn.executemany("INSERT INTO comments VALUES (?, ?, ?)", comments)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def list_missions(self, language: Optional[str] = None, status: Optional[str] = None,
+                      rule_id: Optional[str] = None, before: Optional[int] = None,
+                      limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Newest-first page of mission summaries, optionally filtered. Returns the
+        page and the `before` cursor for the next one (None on the last page).
+        """
+        where, params = [], []
+        if before is not None:
+            where.append("id < ?")
+            params.append(before)
+        if language:
+            where.append("language = ?")
+            params.append(language)
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if rule_id:
+            where.append("EXISTS (SELECT 1 FROM findings f WHERE f.rule_id = ? AND f.mission_id = missions.id)")
+            params.append(rule_id)
+        sql = "SELECT id, title, language, status, pr_status, n_files, n_findings, created_at, finished_at FROM missions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params + [limit + 1])]
+        page = rows[:limit]
+        return page, (page[-1]["id"] if len(rows) > limit else None)
+
+    def get_mission(self, mission_id: int) -> Optional[Dict[str, Any]]:
+        """One mission with its findings, checks, comments and file list (without bodies)."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM missions WHERE id = ?", (mission_id,)).fetchone()
+            if row is None:
+                return None
+            mission = dict(row)
+            mission["timings"] = json.loads(mission["timings"])
+            mission["files"] = [
+                {"filename": r[0], "size": r[1], "fixed": bool(r[2])}
+                for r in self._conn.execute(
+                    "SELECT filename, LENGTH(original), fixed IS NOT NULL FROM files WHERE mission_id = ?", (mission_id,)
+                )
+            ]
+            mission["findings"] = [
+                dict(r) for r in self._conn.execute(
+                    "SELECT filename, rule_id, message FROM findings WHERE mission_id = ?", (mission_id,)
+                )
+            ]
+            mission["checks"] = dict(self._conn.execute(
+                "SELECT name, status FROM checks WHERE mission_id = ?", (mission_id,)
+            ).fetchall())
+            mission["comments"] = [r[0] for r in self._conn.execute(
+                "SELECT body FROM comments WHERE mission_id = ? ORDER BY seq", (mission_id,)
+            )]
+        return mission
+
+    def get_file(self, mission_id: int, filename: str, version: str = "original") -> Optional[str]:
+        column = "fixed" if version == "fixed" else "original"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {column} FROM files WHERE mission_id = ? AND filename = ?", (mission_id, filename)
+            ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from agents import hack_file
+from backends import BACKENDS, make_backend
+from mock_github import MockFile
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_map_keeps_input_order(name):
+    files = [
+        MockFile("a.py", 'password = "x"', "python"),
+        MockFile("b.py", "DEBUG = False", "python"),
+        MockFile("c.rb", 'API_KEY = "k"', "ruby"),
+    ]
+    backend = make_backend(name, max_workers=2)
+    try:
+        results = asyncio.run(backend.map(hack_file, [(f,) for f in files]))
+    finally:
+        backend.shutdown()
+    assert results == [
+        ["Exploit Successful: Extracted Admin Password"],
+        [],
+        ["Exploit Successful: Stolen API Key"],
+    ]
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        make_backend("gpu")
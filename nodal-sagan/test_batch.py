@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from agents import VULN_FILENAMES, VulnerabilityFactory, language_for_path
+from batch import iter_source_files, main, scan_tree
+
+def _make_tree(root):
+    factory = VulnerabilityFactory()
+    for language, filename in VULN_FILENAMES.items():
+        directory = root / language
+        directory.mkdir()
+        (directory / filename).write_text(factory.snippets[language][0][1])
+        for safe_name, safe_content in factory.snippets["safe"][language]:
+            (directory / safe_name).write_text(safe_content)
+    (root / "README.md").write_text("eval(x)")
+    (root / ".git").mkdir()
+    (root / ".git" / "hook.py").write_text("eval(x)")
+
+def test_language_inference_matches_factory_filenames():
+    for language, filename in VULN_FILENAMES.items():
+        assert language_for_path(f"src/{filename}") == language
+    assert language_for_path("notes.txt") is None
+
+def test_discovery_skips_unknown_and_hidden(tmp_path):
+    _make_tree(tmp_path)
+    found = list(iter_source_files([str(tmp_path)]))
+    assert len(found) == 6 * 3
+    assert not any(".git" in path or path.endswith(".md") for path, _ in found)
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_scan_tree_finds_every_vulnerable_file(tmp_path, backend):
+    _make_tree(tmp_path)
+    results = list(scan_tree([str(tmp_path)], jobs=2, backend=backend))
+    flagged = {r.path.rsplit("/", 1)[1] for r in results if r.findings}
+    assert flagged == set(VULN_FILENAMES.values())
+
+def test_cli_emits_json_lines_and_summary(tmp_path, capsys):
+    _make_tree(tmp_path)
+    assert main([str(tmp_path), "--backend", "thread", "-j", "2"]) == 1
+    captured = capsys.readouterr()
+    lines = [json.loads(line) for line in captured.out.splitlines()]
+    assert {line["rule_id"] for line in lines} >= {"py-hardcoded-password", "rb-command-injection"}
+    assert all({"path", "line", "column", "message"} <= line.keys() for line in lines)
+    summary = json.loads(captured.err.splitlines()[-1])
+    assert summary["files"] == 18 and summary["findings"] == len(lines)
+    assert summary["files_per_sec"] > 0 and "mb_per_sec" in summary
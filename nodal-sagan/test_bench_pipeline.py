@@ -0,0 +1,17 @@
+import asyncio
+
+from bench_pipeline import compare, percentiles, run_in_process
+
+def test_percentiles():
+    stats = percentiles([i / 1000 for i in range(1, 101)])
+    assert (stats["p50_ms"], stats["p90_ms"], stats["p99_ms"], stats["max_ms"]) == (50.0, 90.0, 99.0, 100.0)
+    assert percentiles([]) == {}
+
+def test_in_process_run_reports_throughput_and_latency():
+    results = asyncio.run(run_in_process(missions=6, concurrency=2, n_files=5, file_size=1024, density=1.0, seed=1))
+    assert results["files"] == 30
+    assert results["fixed_files"] == 30
+    assert results["scan_mb_per_s"] > 0
+    assert set(results["latency"]) == {"p50_ms", "p90_ms", "p99_ms", "mean_ms", "max_ms"}
+    lines = compare({"results": {"in_process": results}}, {"results": {"in_process": results}})
+    assert lines and all(line.endswith("+0.0%") for line in lines if "n/a" not in line)
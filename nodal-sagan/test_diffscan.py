@@ -0,0 +1,77 @@
+import metrics
+from agents import HackerAgent, hack_file
+from diffscan import changed_line_ranges, scan_changes
+from mock_github import MockFile, MockGitHub
+from rules import scan_content
+
+BASE = "\n".join(f"value_{i} = {i}" for i in range(1, 201)) + "\n"
+
+def _with_lines(content: str, replacements: dict) -> str:
+    lines = content.split("\n")
+    for line_no, text in replacements.items():
+        lines[line_no - 1] = text
+    return "\n".join(lines)
+
+def test_changed_line_ranges_merge_and_clamp():
+    diff = "@@ -2 +2 @@\n-a\n+b\n@@ -6 +6 @@\n-c\n+d\n@@ -40,0 +41,2 @@\n+e\n+f"
+    assert changed_line_ranges(diff, 0, 100) == [(2, 2), (6, 6), (41, 42)]
+    assert changed_line_ranges(diff, 3, 100) == [(1, 9), (38, 45)]
+    assert changed_line_ranges("@@ -5,2 +4,0 @@\n-x\n-y", 1, 100) == [(4, 5)]
+
+def test_findings_map_back_to_file_lines():
+    content = _with_lines(BASE, {120: "result = eval(user_input)"})
+    file = MockFile("app.py", content, "python", base_content=BASE)
+
+    findings = scan_changes(file, context=2)
+
+    assert findings == scan_content(content, "python")
+    assert (findings[0].line, findings[0].column) == (120, 10)
+    assert content[findings[0].offset:].startswith("eval(")
+
+def test_unchanged_vulnerable_code_is_not_rescanned():
+    base = _with_lines(BASE, {10: 'password = "old"'})
+    content = _with_lines(base, {150: "result = eval(user_input)"})
+    file = MockFile("app.py", content, "python", base_content=base)
+
+    assert HackerAgent().hack_changes(file, context=3) == ["Exploit Successful: Remote Code Execution via eval()"]
+    assert len(HackerAgent().hack(file)) == 2
+
+def test_only_the_changed_region_counts_as_scanned():
+    content = _with_lines(BASE, {150: "result = eval(user_input)"})
+    file = MockFile("app.py", content, "python", base_content=BASE)
+    scanned = []
+    scan_changes(file, context=1, on_scanned=scanned.append)
+    assert scanned == [len("value_149 = 149\nresult = eval(user_input)\nvalue_151 = 151\n")]
+
+    before = metrics.SCAN_BYTES.value(language="python")
+    HackerAgent().hack_changes(file, context=1)
+    assert metrics.SCAN_BYTES.value(language="python") == before + scanned[0]
+
+def test_context_window_catches_rule_split_across_lines():
+    base = _with_lines(BASE, {50: 'query = f"SELECT * FROM users WHERE id = {uid}"'})
+    content = _with_lines(base, {52: "cursor.execute(query)"})
+    file = MockFile("db.py", content, "python", base_content=base)
+
+    assert scan_changes(file, context=0) == []
+    assert [f.line for f in scan_changes(file, context=2)] == [50]
+
+def test_new_file_and_updated_content():
+    assert hack_file(MockFile("new.py", "eval(x)", "python"), 3) == ["Exploit Successful: Remote Code Execution via eval()"]
+
+    github = MockGitHub()
+    pr = github.create_pr("pr", [MockFile("a.py", BASE, "python", base_content=BASE)])
+    assert hack_file(pr.files[0], 3) == []
+    github.update_file_content(pr.id, "a.py", BASE + "eval(x)\n")
+    assert hack_file(github.get_pr(pr.id).files[0], 3) == ["Exploit Successful: Remote Code Execution via eval()"]
+
+def test_line_starts_match_split():
+    from diffscan import _line_starts
+    content = "".join(f"{'x' * (i % 7)}\n" for i in range(5000)) + "tail"
+    lines = content.split("\n")
+    expected, offset = {}, 0
+    for number, line in enumerate(lines, start=1):
+        expected[number] = offset
+        offset += len(line) + 1
+    wanted = [1, 2, 999, 1000, 4999, 5001, 5002]
+    got = _line_starts(content, wanted, block=64)
+    assert got == {n: expected.get(n, len(content)) for n in wanted}
@@ -0,0 +1,54 @@
+import asyncio
+
+from events import ChangeFeed, event_stream
+from logstore import MissionLog
+
+def _state(status="RUNNING", logs=()):
+    log = MissionLog()
+    for line in logs:
+        log.append(line)
+    return {"status": status, "current_step": "", "logs": log}
+
+def test_stream_pushes_logs_and_transitions_until_done():
+    async def scenario():
+        state, feed = _state(), ChangeFeed()
+        received = []
+
+        async def consume():
+            async for chunk in event_stream(state, feed):
+                received.append(chunk)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        for i in range(3):
+            state["logs"].append(f"line {i}")
+            state["current_step"] = f"step {i}"
+            feed.notify()
+            await asyncio.sleep(0)
+        state["status"] = "COMPLETED"
+        feed.notify()
+        await asyncio.wait_for(consumer, timeout=1)
+        return received
+
+    received = asyncio.run(scenario())
+    logs = [c for c in received if c.startswith("id:")]
+    assert [c.split("\n")[0] for c in logs] == ["id: 1", "id: 2", "id: 3"]
+    assert all(c.endswith(f'line {i}"\n\n') for i, c in enumerate(logs))
+    assert received[-1].startswith("event: end")
+    assert sum(c.startswith("event: state") for c in received) >= 2
+
+def test_stream_resumes_from_offset():
+    async def scenario():
+        state = _state(status="COMPLETED", logs=["a", "b", "c"])
+        return [c async for c in event_stream(state, ChangeFeed(), offset=2)]
+
+    received = asyncio.run(scenario())
+    assert received[0].startswith("id: 3\nevent: log\n") and received[0].endswith(' c"\n\n')
+    assert len([c for c in received if c.startswith("id:")]) == 1
+
+def test_idle_stream_sends_keepalive():
+    async def scenario():
+        stream = event_stream(_state(), ChangeFeed(), keepalive=0.01)
+        return [await stream.__anext__() for _ in range(2)]
+
+    assert asyncio.run(scenario())[1] == ": keepalive\n\n"
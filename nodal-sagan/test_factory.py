@@ -0,0 +1,46 @@
+import itertools
+
+import pytest
+
+from agents import VulnerabilityFactory
+from rules import scan_content
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+def test_seeded_factory_is_reproducible():
+    a, b = VulnerabilityFactory(7), VulnerabilityFactory(7)
+    assert [a.generate_pr_files("go") for _ in range(5)] == [b.generate_pr_files("go") for _ in range(5)]
+    assert list(VulnerabilityFactory(3).iter_prs(6, n_files=4, file_size=2048)) == \
+        list(VulnerabilityFactory(3).iter_prs(6, n_files=4, file_size=2048))
+
+def test_generate_pr_shape():
+    files = VulnerabilityFactory(1).generate_pr("java", n_files=25, file_size=4096)
+    assert len(files) == 25
+    assert len({name for name, _ in files}) == 25
+    assert all(name.endswith(".java") and len(content) >= 4096 for name, content in files)
+
+def test_density_controls_vulnerable_files():
+    factory = VulnerabilityFactory(1)
+    for language in LANGUAGES:
+        clean = factory.generate_pr(language, n_files=10, file_size=1024, density=0.0)
+        assert not any(scan_content(content, language) for _, content in clean), language
+        dirty = factory.generate_pr(language, n_files=10, file_size=1024, density=1.0)
+        assert all(scan_content(content, language) for _, content in dirty), language
+
+def test_mix_selects_planted_vulnerability():
+    files = VulnerabilityFactory(2).generate_pr("python", n_files=20, density=1.0, mix={"SQL Injection": 1})
+    assert {f.rule_id for _, content in files for f in scan_content(content, "python")} == {"py-sqli-fstring"}
+    with pytest.raises(ValueError):
+        VulnerabilityFactory().generate_pr("python", mix={"Buffer Overflow": 1})
+    with pytest.raises(ValueError):
+        VulnerabilityFactory().generate_pr("python", density=1.0, mix={"SQL Injection": 0})
+
+def test_iter_prs_is_lazy_and_cycles_languages():
+    prs = VulnerabilityFactory(5).iter_prs(languages=["go", "ruby"], n_files=1)
+    assert [language for language, _ in itertools.islice(prs, 5)] == ["go", "ruby", "go", "ruby", "go"]
+
+def test_snippet_table_is_shared_and_read_only():
+    first, second = VulnerabilityFactory(1), VulnerabilityFactory(2)
+    assert first.snippets is second.snippets
+    with pytest.raises(TypeError):
+        first.snippets["python"] = ()
@@ -0,0 +1,65 @@
+from itertools import combinations
+
+from agents import FixerAgent, VulnerabilityFactory, fix_file
+from bench_fix import legacy_fix, legacy_fix_all
+from fixes import FIX_RULES, apply_edits, plan_fixes
+from mock_github import MockFile
+from rules import RULES, scan_content
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+def test_every_rule_has_a_fix():
+    assert set(FIX_RULES) == {rule.id for rules in RULES.values() for rule in rules}
+
+def test_parity_with_legacy_ladder_per_snippet():
+    factory = VulnerabilityFactory()
+    fixer = FixerAgent()
+    for language in LANGUAGES:
+        for _, content in factory.snippets[language]:
+            file = MockFile("f", content, language)
+            for finding in scan_content(content, language):
+                assert fixer.fix(file, finding.message) == legacy_fix(file, finding.message), content
+                assert fixer.fix(file, finding.rule_id) == legacy_fix(file, finding.message), content
+
+def test_single_rule_edits_are_applied_in_file_order():
+    # executeQuery precedes the concatenation, so the rule's second pattern matches first
+    content = ('public void getUser(String userId) {\n    statement.executeQuery(query);\n'
+               '    String query = "SELECT * FROM users WHERE id = " + userId;\n}')
+    file = MockFile("App.java", content, "java")
+    message = "Exploit Successful: SQL Injection via String Concatenation"
+
+    assert FixerAgent().fix(file, message) == legacy_fix(file, message)
+
+def test_parity_with_legacy_ladder_for_combined_findings():
+    factory = VulnerabilityFactory()
+    for language in LANGUAGES:
+        snippets = [content for _, content in factory.snippets[language]]
+        for n in range(1, len(snippets) + 1):
+            for combo in combinations(snippets, n):
+                file = MockFile("f", "\n\n".join(combo), language)
+                bugs = [f.message for f in scan_content(file.content, language)]
+                bugs = list(dict.fromkeys(bugs))
+                assert fix_file(file, bugs).content == legacy_fix_all(file, bugs), file.content
+
+def test_edits_are_spans_of_the_original():
+    content = 'import os\ndef connect():\n    password = "a"\n    x = eval(data)\n'
+    edits = plan_fixes(content, ["py-hardcoded-password", "py-eval-rce"])
+    assert [content[e.start:e.end] for e in edits] == ["", 'password = "a"', "eval("]
+    assert edits[0].text == "import ast\n"
+    assert apply_edits(content, edits) == (
+        'import ast\nimport os\ndef connect():\n    password = os.getenv("PASSWORD")\n    x = ast.literal_eval(data)\n'
+    )
+
+def test_unknown_findings_are_ignored():
+    file = MockFile("f", "x = eval(data)", "python")
+    result = FixerAgent().fix_findings(file, ["Exploit Successful: Something Else", "no-such-rule"])
+    assert result.content == file.content
+    assert result.edits == []
+
+def test_fixed_snippets_no_longer_trigger():
+    factory = VulnerabilityFactory()
+    for language in LANGUAGES:
+        for _, content in factory.snippets[language]:
+            file = MockFile("f", content, language)
+            fixed = fix_file(file, [f.rule_id for f in scan_content(content, language)]).content
+            assert scan_content(fixed, language) == [], fixed
@@ -0,0 +1,27 @@
+import json
+
+from logstore import LogSpill, MissionLog
+
+def test_ring_buffer_caps_memory_and_keeps_sequence():
+    log = MissionLog(capacity=3)
+    for i in range(10):
+        log.append(f"m{i}", agent="hacker", phase="hack")
+
+    assert len(log) == 3 and log.total == 10 and log.first_seq == 7
+    assert [r.message for r in log.since(0)] == ["m7", "m8", "m9"]
+    assert [r.seq for r in log.since(8)] == [8, 9]
+    assert log.since(10) == []
+    assert log.lines(9)[0].endswith("] m9")
+    assert log.to_dicts(9)[0]["agent"] == "hacker"
+
+def test_spill_keeps_full_history(tmp_path):
+    spill = LogSpill(str(tmp_path / "missions.jsonl"))
+    log = MissionLog(capacity=2, spill=spill)
+    log.mission_id = 7
+    for i in range(5):
+        log.append(f"m{i}", phase="fix")
+    spill.close()
+
+    records = [json.loads(line) for line in (tmp_path / "missions.jsonl").read_text().splitlines()]
+    assert [r["message"] for r in records] == [f"m{i}" for i in range(5)]
+    assert all(r["mission"] == 7 and r["phase"] == "fix" for r in records)
@@ -0,0 +1,61 @@
+import asyncio
+
+import metrics
+from agents import HackerAgent, SupervisorAgent
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+from rules import scan_content
+from scheduler import MissionScheduler
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("latency_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        h.observe(value, phase="hack")
+    lines = h.render()
+    assert 'latency_seconds_bucket{phase="hack",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{phase="hack",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{phase="hack",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{phase="hack"} 4' in lines
+
+def test_rule_observer_counts_evaluations_and_hits():
+    stats = metrics.RuleStats()
+    scan_content("x = eval(a)\ny = eval(b)\n", "python", observe=stats.observe)
+    assert stats.get("python", "py-eval-rce")["hits"] == 2
+    password = stats.get("python", "py-hardcoded-password")
+    assert (password["evaluations"], password["hits"]) == (1, 0)
+    assert 'rule_hits_total{language="python",rule="py-eval-rce"} 2' in stats.render()
+
+def test_mission_records_phase_and_scan_metrics():
+    github = MockGitHub()
+    pr = github.create_pr("t", [MockFile("app.go", 'exec.Command("sh", "-c", cmd)', "go")])
+    before = metrics.PHASE_SECONDS.count(phase="validate"), metrics.SCAN_SECONDS.count(language="go")
+    asyncio.run(SupervisorAgent(github, pacing=Pacing("throughput")).run_mission(pr.id, _noop_log))
+    assert metrics.PHASE_SECONDS.count(phase="validate") == before[0] + 1
+    assert metrics.SCAN_SECONDS.count(language="go") == before[1] + 2
+    text = metrics.render({"missions_running": 0})
+    assert "# TYPE mission_phase_seconds histogram" in text
+    assert "missions_running 0" in text
+
+def test_scheduler_records_queue_wait():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=1)
+        async def run():
+            await asyncio.sleep(0)
+        for i in range(3):
+            scheduler.submit(i, {}, run)
+        await scheduler.join()
+        await scheduler.shutdown()
+
+    before = metrics.QUEUE_WAIT_SECONDS.count(), metrics.MISSION_SECONDS.count()
+    asyncio.run(scenario())
+    assert metrics.QUEUE_WAIT_SECONDS.count() == before[0] + 3
+    assert metrics.MISSION_SECONDS.count() == before[1] + 3
+
+def test_profiled_reports_hotspots():
+    with metrics.profiled(top=5) as hotspots:
+        HackerAgent().hack(MockFile("a.py", "x = eval(a)\n" * 1000, "python"))
+    assert 0 < len(hotspots) <= 5
+    assert {"function", "calls", "self_s", "cumulative_s"} <= set(hotspots[0])
@@ -0,0 +1,66 @@
+import threading
+
+from mock_github import MockFile, MockGitHub
+
+def test_bulk_updates_and_indexed_lookup():
+    github = MockGitHub()
+    pr = github.create_pr("bulk", [MockFile(f"f{i}.py", "", "python") for i in range(1000)])
+
+    github.update_files(pr.id, {"f3.py": "a", "f999.py": "b", "missing.py": "c"})
+    github.add_comments(pr.id, ["one", "two"])
+    github.set_checks(pr.id, {"Security Check": "FAIL", "Lint": "PASS"})
+
+    assert pr.get_file("f3.py").content == "a" and pr.get_file("f999.py").content == "b"
+    assert pr.get_file("missing.py") is None
+    assert pr.comments == ["one", "two"]
+    assert pr.checks == {"Security Check": "FAIL", "Lint": "PASS"}
+
+def test_index_follows_direct_file_list_changes():
+    github = MockGitHub()
+    pr = github.create_pr("direct", [MockFile("a.py", "", "python")])
+    pr.files.append(MockFile("b.py", "", "python"))
+    github.update_file_content(pr.id, "b.py", "new")
+    assert pr.files[1].content == "new"
+
+def test_index_follows_replaced_files():
+    github = MockGitHub()
+    pr = github.create_pr("replace", [MockFile("a.py", "", "python"), MockFile("b.py", "", "python")])
+    assert pr.get_file("a.py") is pr.files[0]
+
+    pr.files[0] = MockFile("c.py", "", "python")
+    assert pr.get_file("a.py") is None and pr.get_file("c.py") is pr.files[0]
+    pr.files = [MockFile("d.py", "", "python"), MockFile("b.py", "new", "python")]
+    assert pr.get_file("c.py") is None and pr.get_file("b.py").content == "new"
+
+def test_concurrent_missions_stress():
+    github = MockGitHub()
+    n_threads, prs_per_thread, files_per_pr = 16, 250, 5
+    barrier = threading.Barrier(n_threads)
+    created = [[] for _ in range(n_threads)]
+
+    def worker(t: int):
+        barrier.wait()
+        for i in range(prs_per_thread):
+            pr = github.create_pr(f"{t}-{i}", [MockFile(f"f{j}.py", "", "python") for j in range(files_per_pr)])
+            created[t].append(pr.id)
+            for j in range(files_per_pr):
+                github.add_comment(pr.id, f"c{j}")
+                github.update_file_content(pr.id, f"f{j}.py", f"{t}-{i}-{j}")
+                github.update_check_status(pr.id, "Security Check", "FAIL")
+            github.set_checks(pr.id, {"Security Check": "PASS"})
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [pr_id for ids in created for pr_id in ids]
+    total = n_threads * prs_per_thread
+    assert sorted(ids) == list(range(1, total + 1))
+    assert github.next_pr_id == total + 1
+    for pr in github.prs.values():
+        t, i = pr.title.split("-")
+        assert len(pr.comments) == files_per_pr
+        assert [f.content for f in pr.files] == [f"{t}-{i}-{j}" for j in range(files_per_pr)]
+        assert pr.checks == {"Security Check": "PASS"}
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from agents import SupervisorAgent, VulnerabilityFactory
+from mock_github import MockFile, SlowGitHub
+from outbox import Outbox, OutboxFlushError
+from pacing import Pacing
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def test_writes_are_coalesced_until_flush():
+    github = SlowGitHub()
+    pr = github.create_pr("batch", [MockFile("a.py", "old", "python")])
+    outbox = Outbox(github)
+
+    outbox.add_comments(pr.id, ["breach in a.py"])
+    outbox.set_checks(pr.id, {"Security Check": "FAIL"})
+    outbox.update_files(pr.id, {"a.py": "first"})
+    outbox.update_files(pr.id, {"a.py": "second"})
+    outbox.add_comment(pr.id, "a.py fixed")
+    outbox.update_check_status(pr.id, "Security Check", "PASS")
+    assert github.round_trips == 0 and pr.comments == [] and outbox.pending(pr.id)
+
+    asyncio.run(outbox.flush(pr.id))
+
+    assert github.round_trips == 3
+    assert pr.get_file("a.py").content == "second"
+    assert pr.comments == ["breach in a.py\n\na.py fixed"]
+    assert pr.checks == {"Security Check": "PASS"}
+    assert not outbox.pending(pr.id)
+
+def test_unchanged_check_status_is_not_resent():
+    github = SlowGitHub()
+    pr = github.create_pr("checks", [])
+    outbox = Outbox(github)
+
+    outbox.set_checks(pr.id, {"Security Check": "PASS"})
+    asyncio.run(outbox.flush(pr.id))
+    outbox.set_checks(pr.id, {"Security Check": "PASS"})
+    asyncio.run(outbox.flush(pr.id))
+
+    assert github.round_trips == 1
+
+def test_failed_writes_are_retried():
+    github = SlowGitHub(fail_every=2)
+    pr = github.create_pr("flaky", [])
+    outbox = Outbox(github, backoff=0)
+
+    outbox.add_comment(pr.id, "hello")
+    outbox.set_checks(pr.id, {"Security Check": "PASS"})
+    asyncio.run(outbox.flush(pr.id))
+
+    assert outbox.retries == 1
+    assert pr.comments == ["hello"] and pr.checks == {"Security Check": "PASS"}
+
+def test_writes_stay_queued_when_the_host_keeps_failing():
+    github = SlowGitHub(fail_every=1)
+    pr = github.create_pr("down", [])
+    outbox = Outbox(github, max_retries=2, backoff=0)
+
+    outbox.add_comment(pr.id, "hello")
+    with pytest.raises(OutboxFlushError):
+        asyncio.run(outbox.flush(pr.id))
+
+    assert github.round_trips == 3
+    assert outbox.pending(pr.id)
+    github.fail_every = 0
+    asyncio.run(outbox.flush(pr.id))
+    assert pr.comments == ["hello"]
+
+def test_undelivered_writes_of_a_finished_mission_are_retried():
+    github = SlowGitHub(fail_every=1)
+    pr = github.create_pr("down", [])
+    outbox = Outbox(github, max_retries=0, backoff=0)
+
+    outbox.add_comment(pr.id, "hello")
+    with pytest.raises(OutboxFlushError):
+        asyncio.run(outbox.flush(pr.id))
+    outbox.finish(pr.id)
+    assert outbox.pending(pr.id)
+
+    asyncio.run(outbox.retry_pending())
+    assert outbox.pending(pr.id)
+    github.fail_every = 0
+    asyncio.run(outbox.retry_pending())
+    assert pr.comments == ["hello"]
+    assert not outbox.pending(pr.id) and pr.id not in outbox._sent_checks
+
+def test_background_retries_leave_running_missions_alone():
+    async def scenario():
+        github = SlowGitHub()
+        pr = github.create_pr("paced", [MockFile("app.py", VulnerabilityFactory.snippets["python"][1][1], "python")])
+        outbox = Outbox(github)
+        pacing = Pacing("throughput")
+        pacing.delay = 0.01
+        supervisor = SupervisorAgent(github, pacing=pacing, outbox=outbox)
+        retry = asyncio.create_task(outbox.run(interval=0.001))
+        try:
+            await supervisor.run_mission(pr.id, _noop_log)
+            outbox.finish(pr.id)
+            await asyncio.sleep(0.01)
+        finally:
+            retry.cancel()
+        return github, pr
+
+    github, pr = asyncio.run(scenario())
+    assert len(pr.comments) == 1 and github.round_trips == 3
+    assert pr.checks == {"Security Check": "PASS"}
+
+def test_mission_through_outbox_matches_direct_writes():
+    def run(outbox: bool):
+        factory = VulnerabilityFactory(seed=3)
+        github = SlowGitHub()
+        pr = github.create_pr("mission", [MockFile(name, content, "python")
+                                          for name, content in factory.generate_pr("python", n_files=6, density=0.5)])
+        supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), outbox=Outbox(github) if outbox else None)
+        result = asyncio.run(supervisor.run_mission(pr.id, _noop_log))
+        return github, pr, result
+
+    direct_github, direct_pr, direct = run(outbox=False)
+    batched_github, batched_pr, batched = run(outbox=True)
+
+    assert batched["findings"] == direct["findings"] and batched["fixes"] == direct["fixes"]
+    assert [f.content for f in batched_pr.files] == [f.content for f in direct_pr.files]
+    assert batched_pr.checks == direct_pr.checks == {"Security Check": "PASS"}
+    assert batched_pr.comments == ["\n\n".join(direct_pr.comments)]
+    assert batched_github.round_trips == 3 < direct_github.round_trips
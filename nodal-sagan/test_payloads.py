@@ -0,0 +1,69 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import app
+from logstore import MissionLog
+from payloads import content_hash, describe_files, describe_tests, etag_response, summarize_state
+
+def _state():
+    logs = MissionLog()
+    logs.append("hello")
+    state = {
+        "status": "COMPLETED",
+        "logs": logs,
+        "current_step": "Done",
+        "pr_details": {"id": 7, "title": "t", "status": "open", "files": {"app.py": "x = eval(a)"}},
+        "vulnerabilities": ["v"],
+        "fixed_code": {"app.py": "import ast\nx = ast.literal_eval(a)"},
+        "generated_tests": ["def test(): pass"],
+        "timings": {},
+    }
+    state["digests"] = {
+        "files": describe_files(state["pr_details"]["files"]),
+        "fixed_code": describe_files(state["fixed_code"]),
+        "generated_tests": describe_tests(state["generated_tests"]),
+    }
+    return state
+
+def test_summary_replaces_bodies_with_hashes():
+    state = _state()
+    view = summarize_state(state, since=0)
+    assert view["pr_details"]["files"] == {"app.py": {"hash": content_hash("x = eval(a)"), "size": 11}}
+    assert view["fixed_code"]["app.py"]["hash"] == content_hash(state["fixed_code"]["app.py"])
+    assert view["generated_tests"]["count"] == 1
+    assert view["logs"] and view["log_total"] == 1
+    assert "eval(a)" not in json.dumps(view) and "digests" not in view
+
+def test_etag_response_honours_if_none_match():
+    tag = content_hash("body")
+    assert etag_response("body", tag, None, "text/plain").status_code == 200
+    assert etag_response("body", tag, f'"{tag}"', "text/plain").status_code == 304
+    assert etag_response("body", tag, f'"other", W/"{tag}"', "text/plain").status_code == 304
+    assert etag_response("body", tag, '"other"', "text/plain").status_code == 200
+
+def test_file_and_test_endpoints(monkeypatch):
+    state = _state()
+    monkeypatch.setattr(app, "scheduler", SimpleNamespace(get=lambda mission_id: SimpleNamespace(id=mission_id, state=state)))
+
+    original = asyncio.run(app.get_mission_file(7, "app.py", "original", None))
+    assert original.body == b"x = eval(a)"
+    assert original.headers["etag"] == f'"{content_hash("x = eval(a)")}"'
+    fixed = asyncio.run(app.get_mission_file(7, "app.py", "fixed", None))
+    assert fixed.body.startswith(b"import ast")
+    again = asyncio.run(app.get_mission_file(7, "app.py", "fixed", fixed.headers["etag"]))
+    assert again.status_code == 304 and again.body == b""
+
+    tests = asyncio.run(app.get_mission_tests(7, None))
+    assert json.loads(tests.body) == state["generated_tests"]
+
+def test_mission_endpoint_returns_logs_since_offset(monkeypatch):
+    state = _state()
+    state["logs"].append("world")
+    mission = SimpleNamespace(id=7, state=state, timing=lambda: {})
+    monkeypatch.setattr(app, "scheduler", SimpleNamespace(get=lambda mission_id: mission))
+
+    view = asyncio.run(app.get_mission(7, since=1))
+    assert view["id"] == 7 and len(view["logs"]) == 1 and view["logs"][0].endswith("world")
+    assert view["log_offset"] == 1 and view["log_total"] == 2
+    assert view["pr_details"]["files"]["app.py"]["hash"] == content_hash("x = eval(a)")
@@ -0,0 +1,41 @@
+from agents import FixerAgent, HackerAgent, VulnerabilityFactory
+from bench_scan import legacy_hack
+from mock_github import MockFile
+from rules import scan_content
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+def _corpus():
+    """Every factory snippet (vulnerable, safe and fixed) as (language, content)."""
+    factory = VulnerabilityFactory()
+    fixer = FixerAgent()
+    for language in LANGUAGES:
+        for _, content in factory.snippets[language]:
+            yield language, content
+            for message in legacy_hack(content, language):
+                yield language, fixer.fix(MockFile("f", content, language), message)
+        for _, content in factory.snippets["safe"][language]:
+            yield language, content
+
+def test_parity_with_legacy_ladder():
+    hacker = HackerAgent()
+    for language, content in _corpus():
+        assert hacker.hack(MockFile("f", content, language)) == legacy_hack(content, language), content
+
+def test_every_vulnerable_snippet_is_found():
+    factory = VulnerabilityFactory()
+    for language in LANGUAGES:
+        for _, content in factory.snippets[language]:
+            assert scan_content(content, language), content
+
+def test_findings_carry_line_and_column():
+    content = "x = 1\ny = 2\n  z = eval(data)\nw = eval(other)\n"
+    findings = scan_content(content, "python")
+    assert [(f.rule_id, f.line, f.column) for f in findings] == [
+        ("py-eval-rce", 3, 7),
+        ("py-eval-rce", 4, 5),
+    ]
+    assert content[findings[0].offset:].startswith("eval(")
+
+def test_unknown_language_has_no_findings():
+    assert scan_content("eval(x)", "cobol") == []
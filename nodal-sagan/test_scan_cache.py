@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import rules
+from agents import SupervisorAgent
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+from scan_cache import ScanCache
+
+def test_lru_eviction_and_counters():
+    cache = ScanCache(max_entries=2)
+    a, b, c = (MockFile(n, n, "python") for n in "abc")
+    cache.put(cache.key(a), ["A"])
+    cache.put(cache.key(b), [])
+    assert cache.get(cache.key(a)) == ["A"]  # a becomes most recent
+    cache.put(cache.key(c), [])               # evicts b
+    assert cache.get(cache.key(b)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 1, 1, 2)
+
+def test_key_depends_on_language_content_and_ruleset(monkeypatch):
+    base = ScanCache.key(MockFile("x", "eval(x)", "python"))
+    assert ScanCache.key(MockFile("other_name", "eval(x)", "python")) == base
+    assert ScanCache.key(MockFile("x", "eval(x)", "ruby")) != base
+    assert ScanCache.key(MockFile("x", "eval(y)", "python")) != base
+    monkeypatch.setattr(rules, "RULESET_VERSION", "changed")
+    assert ScanCache.key(MockFile("x", "eval(x)", "python")) != base
+
+def test_keys_are_hashed_off_the_event_loop(monkeypatch):
+    hashed_on = []
+    key = ScanCache.key
+
+    def recording_key(file, diff_context=None):
+        hashed_on.append(threading.current_thread())
+        return key(file, diff_context)
+
+    monkeypatch.setattr(ScanCache, "key", staticmethod(recording_key))
+    supervisor = SupervisorAgent(MockGitHub(), pacing=Pacing("throughput"), scan_cache=ScanCache())
+    asyncio.run(supervisor.hack_files([MockFile("app.py", "eval(x)", "python")]))
+    assert hashed_on and threading.main_thread() not in hashed_on
+
+def test_unchanged_files_are_not_rehacked():
+    async def noop_log(message: str, **fields):
+        pass
+
+    cache = ScanCache()
+    github = MockGitHub()
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), scan_cache=cache)
+    files = lambda: [
+        MockFile("app.py", "result = eval(user_input)", "python"),
+        MockFile("utils.py", "DEBUG = False", "python"),
+    ]
+
+    asyncio.run(supervisor.run_mission(github.create_pr("first", files()).id, noop_log))
+    # Phase 1 misses both; validation only re-hacks (and misses) the patched app.py
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    asyncio.run(supervisor.run_mission(github.create_pr("rebase", files()).id, noop_log))
+    assert (cache.hits, cache.misses) == (3, 3)
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from scheduler import MissionScheduler, QueueFullError
+
+def test_missions_run_concurrently_within_worker_bound():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=3, max_queue=50)
+        active, peak, done = 0, 0, []
+
+        def job(i):
+            async def run():
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                done.append(i)
+            return run
+
+        for i in range(20):
+            scheduler.submit(i, {"status": "QUEUED"}, job(i))
+        await scheduler.join()
+        metrics = scheduler.metrics()
+        await scheduler.shutdown()
+        return peak, done, metrics
+
+    peak, done, metrics = asyncio.run(scenario())
+    assert peak == 3
+    assert sorted(done) == list(range(20))
+    assert metrics["completed"] == 20 and metrics["queue_depth"] == 0 and metrics["running"] == 0
+
+def test_full_queue_applies_backpressure():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=1, max_queue=2)
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        scheduler.submit(1, {}, blocked)
+        await asyncio.sleep(0)  # let the worker pick up mission 1
+        scheduler.submit(2, {}, blocked)
+        scheduler.submit(3, {}, blocked)
+        with pytest.raises(QueueFullError):
+            scheduler.submit(4, {}, blocked)
+        metrics = scheduler.metrics()
+
+        gate.set()
+        await scheduler.join()
+        await scheduler.shutdown()
+        return metrics, scheduler
+
+    metrics, scheduler = asyncio.run(scenario())
+    assert metrics["queue_depth"] == 2 and metrics["running"] == 1 and metrics["rejected"] == 1
+    assert scheduler.get(4) is None
+    assert scheduler.get(1).timing()["run_time"] is not None
+
+def test_failed_mission_does_not_stop_worker():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=1, max_queue=10)
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        async def ok():
+            pass
+
+        scheduler.submit(1, {}, boom)
+        scheduler.submit(2, {}, ok)
+        await scheduler.join()
+        await scheduler.shutdown()
+        return scheduler.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["failed"] == 1 and metrics["completed"] == 1
+
+def test_only_the_latest_finished_missions_are_kept():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=1, max_queue=10, max_finished=3)
+
+        async def run():
+            pass
+
+        for i in range(5):
+            scheduler.submit(i, {"status": "QUEUED"}, run)
+        await scheduler.join()
+        await scheduler.shutdown()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert sorted(scheduler.missions) == [2, 3, 4]
+    assert scheduler.get(0) is None and scheduler.metrics()["completed"] == 5
+
+def test_reserved_slot_is_held_until_submit_or_release():
+    async def scenario():
+        scheduler = MissionScheduler(max_workers=1, max_queue=1)
+
+        async def run():
+            pass
+
+        scheduler.reserve()
+        with pytest.raises(QueueFullError):
+            scheduler.submit(1, {}, run)
+        scheduler.release()
+        scheduler.reserve()
+        scheduler.submit(2, {}, run, reserved=True)
+        await scheduler.join()
+        await scheduler.shutdown()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.get(1) is None and scheduler.get(2) is not None
+    assert scheduler.metrics()["rejected"] == 1 and scheduler._reserved == 0
@@ -0,0 +1,67 @@
+import asyncio
+
+from agents import SupervisorAgent
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+from store import MissionRecord, MissionStore
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def _record(mission_id, language="python", status="COMPLETED", findings=None):
+    return MissionRecord(
+        id=mission_id, title=f"PR {mission_id}", language=language, status=status, pr_status="OPEN",
+        files={"app.py": "x = eval(a)"}, findings=findings or {},
+    )
+
+def test_mission_round_trip(tmp_path):
+    github = MockGitHub()
+    original = "result = eval(user_input)"
+    pr = github.create_pr("Feature", [MockFile("app.py", original, "python"), MockFile("utils.py", "DEBUG = False", "python")])
+    result = asyncio.run(SupervisorAgent(github, pacing=Pacing("throughput")).run_mission(pr.id, _noop_log))
+
+    store = MissionStore(str(tmp_path / "missions.db"))
+    store.record_mission(MissionRecord.from_mission(
+        pr, "python", "COMPLETED", {"app.py": original, "utils.py": "DEBUG = False"}, result, created_at=1.0,
+    ))
+
+    mission = store.get_mission(pr.id)
+    assert mission["language"] == "python" and mission["n_findings"] == 1
+    assert mission["findings"] == [{"filename": "app.py", "rule_id": "py-eval-rce", "message": result["vulnerabilities"][0]}]
+    assert mission["checks"] == {"Security Check": "PASS"}
+    assert {f["filename"]: f["fixed"] for f in mission["files"]} == {"app.py": True, "utils.py": False}
+    assert store.get_file(pr.id, "app.py") == original
+    assert "ast.literal_eval" in store.get_file(pr.id, "app.py", "fixed")
+    assert store.get_file(pr.id, "utils.py", "fixed") is None
+    assert store.get_mission(999) is None
+
+def test_history_pages_and_filters(tmp_path):
+    store = MissionStore(str(tmp_path / "missions.db"))
+    eval_finding = {"app.py": ["Exploit Successful: Remote Code Execution via eval()"]}
+    store.record_missions([
+        _record(i, language="go" if i % 2 else "python", status="ERROR" if i == 4 else "COMPLETED",
+                findings=eval_finding if i in (2, 6) else None)
+        for i in range(1, 11)
+    ])
+
+    page, cursor = store.list_missions(limit=4)
+    assert [m["id"] for m in page] == [10, 9, 8, 7] and cursor == 7
+    page, cursor = store.list_missions(before=cursor, limit=4)
+    assert [m["id"] for m in page] == [6, 5, 4, 3]
+    page, cursor = store.list_missions(before=cursor, limit=4)
+    assert [m["id"] for m in page] == [2, 1] and cursor is None
+
+    assert [m["id"] for m in store.list_missions(language="go")[0]] == [9, 7, 5, 3, 1]
+    assert [m["id"] for m in store.list_missions(status="ERROR")[0]] == [4]
+    assert [m["id"] for m in store.list_missions(rule_id="py-eval-rce")[0]] == [6, 2]
+
+def test_store_survives_restart(tmp_path):
+    path = str(tmp_path / "missions.db")
+    store = MissionStore(path)
+    assert store.last_mission_id() == 0
+    store.record_missions([_record(1), _record(2)])
+    store.close()
+
+    reopened = MissionStore(path)
+    assert reopened.last_mission_id() == 2
+    assert reopened.get_mission(2)["title"] == "PR 2"
@@ -0,0 +1,47 @@
+import io
+import tracemalloc
+
+import pytest
+
+from bench_scan import build_corpus
+from rules import COMPILED_RULES, scan_content, scan_path, scan_stream
+
+LANGUAGES = ["python", "javascript", "abap", "java", "go", "ruby"]
+
+@pytest.mark.parametrize("language", LANGUAGES)
+@pytest.mark.parametrize("chunk_size", [7, 64, 4096])
+def test_stream_matches_in_memory(language, chunk_size):
+    content = build_corpus(language, 20_000)
+    expected = scan_content(content, language)
+    assert expected
+    assert scan_stream(io.StringIO(content), language, chunk_size=chunk_size) == expected
+    assert scan_stream(io.BytesIO(content.encode()), language, chunk_size=chunk_size) == expected
+
+def test_match_straddling_chunk_boundary():
+    # A small overlap makes chunk boundaries fall inside the match for many chunk sizes
+    ruleset = COMPILED_RULES["python"]
+    content = "x = 1\n" * 10 + 'password   =   "hunter2"\n' + "y = 2\n" * 10
+    for chunk_size in range(1, len(content) + 1):
+        findings = ruleset.scan_stream(io.StringIO(content), chunk_size=chunk_size, overlap=32)
+        assert [(f.line, f.column, f.offset) for f in findings] == [(11, 1, 60)], chunk_size
+
+def test_forbidden_atom_in_later_chunk_suppresses_finding():
+    content = "result = eval(x)\n" + "pass\n" * 1000 + "import ast; ast.literal_eval(y)\n"
+    assert scan_content(content, "python") == []
+    assert scan_stream(io.StringIO(content), "python", chunk_size=100) == []
+
+def test_scan_path_memory_is_bounded(tmp_path):
+    content = build_corpus("python", 16 * 1024 * 1024)
+    path = tmp_path / "big.py"
+    path.write_text(content)
+    expected = scan_content(content, "python")
+    del content
+
+    tracemalloc.start()
+    findings = scan_path(str(path), "python", chunk_size=256 * 1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert findings == expected
+    # A few chunk-sized windows at most, nowhere near the 16 MB file
+    assert peak < 4 * 1024 * 1024
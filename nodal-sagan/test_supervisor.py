@@ -0,0 +1,159 @@
+import asyncio
+
+import fixes
+
+from agents import SupervisorAgent, VulnerabilityFactory
+from mock_github import MockFile, MockGitHub
+from pacing import Pacing
+
+async def _noop_log(message: str, **fields):
+    pass
+
+def _run(github: MockGitHub, pr_id: int):
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"))
+    return asyncio.run(supervisor.run_mission(pr_id, _noop_log))
+
+def test_only_vulnerable_files_are_fixed():
+    factory = VulnerabilityFactory()
+    github = MockGitHub()
+    pr = github.create_pr("mixed", [
+        MockFile("app.py", factory.snippets["python"][1][1], "python"),
+        MockFile("utils.py", "def format_date(d):\n    return d.isoformat()", "python"),
+        MockFile("db.py", factory.snippets["python"][0][1], "python"),
+    ])
+
+    result = _run(github, pr.id)
+
+    assert result["findings"] == {
+        "app.py": ["Exploit Successful: Remote Code Execution via eval()"],
+        "db.py": ["Exploit Successful: Extracted Admin Password"],
+    }
+    assert [fix["filename"] for fix in result["fixes"]] == ["app.py", "db.py"]
+    assert len(result["tests"]) == 2
+    assert github.get_pr(pr.id).files[1].content == "def format_date(d):\n    return d.isoformat()"
+    assert github.get_pr(pr.id).checks["Security Check"] == "PASS"
+
+def test_clean_pr_skips_remediation():
+    github = MockGitHub()
+    pr = github.create_pr("clean", [MockFile("config.py", "DEBUG = False", "python")])
+
+    result = _run(github, pr.id)
+
+    assert result["findings"] == {} and result["fixes"] == [] and result["tests"] == []
+    assert "fix" not in result["timings"]
+
+def test_validation_rescans_only_patched_files():
+    factory = VulnerabilityFactory()
+    github = MockGitHub()
+    pr = github.create_pr("mixed", [
+        MockFile("app.py", factory.snippets["python"][1][1], "python"),
+        MockFile("utils.py", "DEBUG = False", "python"),
+        MockFile("config.py", "MAX_RETRIES = 5", "python"),
+    ])
+
+    result = _run(github, pr.id)
+
+    assert result["validation"] == {
+        "rescanned": 1, "rescanned_bytes": len(result["fixes"][0]["content"]), "reused": 2,
+        "fail_fast": False, "stopped_early": False,
+    }
+    assert github.get_pr(pr.id).checks["Security Check"] == "PASS"
+
+def test_unpatched_findings_are_reused_and_fail_fast_stops_early():
+    # The fixer has no rewrite for this query shape, so the file stays unchanged
+    unfixable = 'q = f"SELECT * FROM orders WHERE id = {oid}"'
+    factory = VulnerabilityFactory()
+    github = MockGitHub()
+    files = lambda: [
+        MockFile("orders.py", unfixable, "python"),
+        MockFile("app.py", factory.snippets["python"][1][1], "python"),
+    ]
+
+    full = github.create_pr("full", files())
+    result = _run(github, full.id)
+    assert result["validation"]["rescanned"] == 1
+    assert github.get_pr(full.id).checks["Security Check"] == "FAIL"
+
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), fail_fast=True)
+    pr = github.create_pr("gate", files())
+    result = asyncio.run(supervisor.run_mission(pr.id, _noop_log))
+    assert result["validation"]["stopped_early"] is True
+    # Stopping on the unfixable file means the patched one was never re-scanned
+    assert result["validation"]["rescanned"] == 0 and result["validation"]["rescanned_bytes"] == 0
+    assert result["validation"]["reused"] == 2
+    assert result["rounds"][0]["changed"] == 1 and result["rounds"][0]["rescanned"] == 0
+    assert github.get_pr(pr.id).checks["Security Check"] == "FAIL"
+
+def test_fail_fast_passes_clean_patches():
+    factory = VulnerabilityFactory()
+    github = MockGitHub()
+    pr = github.create_pr("gate", [MockFile(f"m{i}.py", factory.snippets["python"][i][1], "python") for i in range(3)])
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), fail_fast=True)
+
+    result = asyncio.run(supervisor.run_mission(pr.id, _noop_log))
+
+    assert result["validation"] == {
+        "rescanned": 3, "rescanned_bytes": sum(len(fix["content"]) for fix in result["fixes"]), "reused": 0,
+        "fail_fast": True, "stopped_early": False,
+    }
+    assert github.get_pr(pr.id).checks["Security Check"] == "PASS"
+
+def _partial_eval_fix(monkeypatch):
+    # A fixer that only strips one "!" per pass, so each round changes the file but leaves the exploit
+    monkeypatch.setitem(fixes.FIX_RULES, "py-eval-rce", fixes.FixRule("py-eval-rce", replacements=(("eval(a)!", "eval(a)"),)))
+
+def test_fix_loop_runs_until_no_progress(monkeypatch):
+    _partial_eval_fix(monkeypatch)
+    github = MockGitHub()
+    pr = github.create_pr("partial", [
+        MockFile("app.py", "x = eval(a)!!", "python"),
+        MockFile("utils.py", "DEBUG = False", "python"),
+    ])
+
+    result = _run(github, pr.id)
+
+    assert result["iterations"] == 3
+    assert [(r["round"], r["fixed"], r["changed"], r["remaining"]) for r in result["rounds"]] == [
+        (1, 1, 1, 1), (2, 1, 1, 1), (3, 1, 0, 1),
+    ]
+    assert result["converged"] is False and result["no_progress"] == ["app.py"]
+    assert result["fixes"][0]["content"] == "x = eval(a)"
+    assert {edit["round"] for edit in result["fixes"][0]["edits"]} == {1, 2}
+    assert len(result["tests"]) == 1
+    assert result["validation"]["reused"] == 1
+    assert github.get_pr(pr.id).checks["Security Check"] == "FAIL"
+
+def test_fix_loop_respects_round_cap(monkeypatch):
+    _partial_eval_fix(monkeypatch)
+    github = MockGitHub()
+    pr = github.create_pr("partial", [MockFile("app.py", "x = eval(a)!!!!", "python")])
+    supervisor = SupervisorAgent(github, pacing=Pacing("throughput"), max_rounds=2)
+
+    result = asyncio.run(supervisor.run_mission(pr.id, _noop_log))
+
+    assert result["iterations"] == 2
+    assert result["no_progress"] == [] and result["converged"] is False
+    assert github.get_pr(pr.id).files[0].content == "x = eval(a)!!"
+
+def test_fix_loop_detects_cycles(monkeypatch):
+    monkeypatch.setitem(fixes.FIX_RULES, "py-eval-rce", fixes.FixRule(
+        "py-eval-rce", replacements=(("eval(x)", "eval(y)"), ("eval(y)", "eval(x)")),
+    ))
+    github = MockGitHub()
+    pr = github.create_pr("cycle", [MockFile("app.py", "r = eval(x)", "python")])
+
+    result = _run(github, pr.id)
+
+    # Round 2 would bring back round 1's input, so the loop stops there
+    assert result["iterations"] == 2
+    assert result["no_progress"] == ["app.py"]
+
+def test_single_pass_fix_converges_in_one_round():
+    factory = VulnerabilityFactory()
+    github = MockGitHub()
+    pr = github.create_pr("clean fix", [MockFile("app.py", factory.snippets["python"][0][1], "python")])
+
+    result = _run(github, pr.id)
+
+    assert result["iterations"] == 1 and result["converged"] is True
+    assert set(result["rounds"][0]) == {"round", "fixed", "changed", "rescanned", "remaining", "fix_seconds", "validate_seconds"}